@@ -0,0 +1,297 @@
+"""
+Benchmarks for mil_api.Client against a local controller stand-in.
+
+    python benchmarks/bench_client.py                     # full run, saves JSON
+    python benchmarks/bench_client.py --quick             # smoke run
+    python benchmarks/bench_client.py --compare benchmarks/results/old.json
+    python benchmarks/bench_client.py --host 10.0.0.5 --port 60000   # real controller
+    python benchmarks/bench_client.py --backend fake      # no sockets or native library
+
+By default mil_sim is started in a separate process on a free port, so the
+server never competes with the client for the GIL. Results are written to
+benchmarks/results/<commit>-<timestamp>.json (or --output) together with the
+commit, Python version, platform and the run parameters; --compare prints
+the change against an earlier result file. Latencies are in microseconds.
+With --backend fake the Client runs on mil_api.FakeBackend, which isolates
+the cost of the Python layer from the network and the native library.
+
+Cases:
+    read_latency      sequential get_dword_value() round trips
+    read_pipelined    read_many() batches, reads per second
+    write_throughput  set_dword_value() and write_many(), writes per second
+                      (ends with a read so every write reached the server)
+    mixed             N threads issuing reads and writes for a fixed time
+    connect           connect() + disconnect() of a fresh Client
+"""
+import argparse
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import mil_api  # noqa: E402
+from mil_api import Client, FakeBackend, Histogram  # noqa: E402
+
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+CASES = ('read_latency', 'read_pipelined', 'write_throughput', 'mixed', 'connect')
+
+# Each mixed-case thread reads dwords from its own block of addresses, and
+# every block must lie inside the native dword image
+MIXED_BLOCK = 16
+MAX_MIXED_THREADS = mil_api._READ_LIMITS['dword'] // MIXED_BLOCK
+
+# (full, quick) sizes
+SIZES = {
+    'read_latency': (5000, 300),
+    'read_pipelined': (200, 20),   # batches
+    'batch': (64, 64),
+    'writes': (20000, 1000),
+    'mixed_seconds': (5.0, 1.0),
+    'connects': (50, 5),
+}
+
+
+def _latency_summary(histogram: Histogram) -> Dict[str, float]:
+    """Histogram of nanoseconds -> summary in microseconds."""
+    snapshot = histogram.snapshot()
+    return {key: (value if key == 'count' else round(value / 1000, 2)) for key, value in snapshot.items()}
+
+
+def _free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def _start_simulator(port: int) -> subprocess.Popen:
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, 'mil_sim.py'), '--port', str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
+    process.kill()
+    raise RuntimeError("Simulator did not start")
+
+
+def _connected_client(args) -> Client:
+    client = Client(latency_mode=args.latency_mode, backend=args.backend_instance)
+    client.connect(args.host, args.port)
+    return client
+
+
+def bench_read_latency(args, size: int) -> Dict[str, object]:
+    with _connected_client(args) as client:
+        for address in range(50):  # Warm up
+            client.get_dword_value(address)
+        histogram = Histogram()
+        for i in range(size):
+            start = time.perf_counter_ns()
+            client.get_dword_value(i % 256)
+            histogram.record(time.perf_counter_ns() - start)
+    return {'latency_us': _latency_summary(histogram)}
+
+
+def bench_read_pipelined(args, batches: int, batch: int) -> Dict[str, object]:
+    items = [(address, 'dword') for address in range(batch)]
+    with _connected_client(args) as client:
+        client.read_many(items)
+        histogram = Histogram()
+        start = time.perf_counter()
+        for _ in range(batches):
+            batch_start = time.perf_counter_ns()
+            client.read_many(items)
+            histogram.record(time.perf_counter_ns() - batch_start)
+        elapsed = time.perf_counter() - start
+    return {'reads_per_s': round(batches * batch / elapsed), 'batch': batch,
+            'batch_latency_us': _latency_summary(histogram)}
+
+
+def bench_write_throughput(args, size: int, batch: int) -> Dict[str, object]:
+    with _connected_client(args) as client:
+        start = time.perf_counter()
+        for i in range(size):
+            client.set_dword_value(i % 256, i)
+        client.get_dword_value(0)  # Writes are ordered ahead of this reply
+        single = size / (time.perf_counter() - start)
+
+        items = [(address, 'dword', address) for address in range(batch)]
+        start = time.perf_counter()
+        for _ in range(size // batch):
+            client.write_many(items)
+        client.get_dword_value(0)
+        batched = (size // batch) * batch / (time.perf_counter() - start)
+    return {'single_writes_per_s': round(single), 'write_many_per_s': round(batched), 'batch': batch}
+
+
+def bench_mixed(args, seconds: float, threads: int) -> Dict[str, object]:
+    """Each thread loops read, write, read_many(8) on its own address range."""
+    with _connected_client(args) as client:
+        stop = threading.Event()
+        histograms = [Histogram() for _ in range(threads)]
+        counts = [0] * threads
+        errors: List[str] = []
+
+        def worker(index: int):
+            base = index * MIXED_BLOCK
+            batch = [(base + offset, 'word') for offset in range(8)]
+            histogram = histograms[index]
+            ops = 0
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter_ns()
+                    client.get_dword_value(base)
+                    histogram.record(time.perf_counter_ns() - start)
+                    client.set_dword_value(base + 1, ops)
+                    client.read_many(batch)
+                    ops += 10
+            except Exception as e:
+                errors.append(repr(e))
+            counts[index] = ops
+
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        start = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in workers:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    merged = Histogram()
+    for histogram in histograms:
+        merged.merge(histogram)
+    return {'threads': threads, 'ops_per_s': round(sum(counts) / elapsed),
+            'read_latency_us': _latency_summary(merged), 'errors': errors[:5]}
+
+
+def bench_connect(args, size: int) -> Dict[str, object]:
+    connect_histogram, disconnect_histogram = Histogram(), Histogram()
+    for _ in range(size):
+        client = Client(latency_mode=args.latency_mode, backend=args.backend_instance)
+        start = time.perf_counter_ns()
+        client.connect(args.host, args.port)
+        connected = time.perf_counter_ns()
+        client.disconnect()
+        connect_histogram.record(connected - start)
+        disconnect_histogram.record(time.perf_counter_ns() - connected)
+    return {'connect_us': _latency_summary(connect_histogram),
+            'disconnect_us': _latency_summary(disconnect_histogram)}
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(args) -> Dict[str, object]:
+    level = 1 if args.quick else 0
+    size = {name: sizes[level] for name, sizes in SIZES.items()}
+    cases = {
+        'read_latency': lambda: bench_read_latency(args, size['read_latency']),
+        'read_pipelined': lambda: bench_read_pipelined(args, size['read_pipelined'], size['batch']),
+        'write_throughput': lambda: bench_write_throughput(args, size['writes'], size['batch']),
+        'mixed': lambda: bench_mixed(args, size['mixed_seconds'], args.threads),
+        'connect': lambda: bench_connect(args, size['connects']),
+    }
+    results = {}
+    for name in args.only or CASES:
+        print(f"{name} ...", end=' ', flush=True)
+        results[name] = cases[name]()
+        print(json.dumps(results[name]))
+    return {
+        'meta': {
+            'commit': _git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'library': mil_api.LIB_NAME,
+            'backend': args.backend,
+            'server': None if args.backend == 'fake' else 'mil_sim' if args.simulator else f"{args.host}:{args.port}",
+            'latency_mode': args.latency_mode,
+            'quick': args.quick,
+        },
+        'results': results,
+    }
+
+
+def _flatten(prefix: str, value, out: Dict[str, float]):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else key, item, out)
+    elif isinstance(value, (int, float)) and not isinstance(value, bool):
+        out[prefix] = value
+
+
+def compare(old: Dict[str, object], new: Dict[str, object]):
+    """Prints every numeric result that exists in both runs with its relative change."""
+    before, after = {}, {}
+    _flatten('', old['results'], before)
+    _flatten('', new['results'], after)
+    print(f"\n{'metric':<45} {old['meta']['commit']:>12} {new['meta']['commit']:>12} {'change':>8}")
+    for key, value in after.items():
+        if key in before and not key.endswith('.count'):
+            change = f"{(value - before[key]) / before[key] * 100:+.1f}%" if before[key] else ''
+            print(f"{key:<45} {before[key]:>12} {value:>12} {change:>8}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=None, help="server to use instead of a local simulator")
+    parser.add_argument('--quick', action='store_true', help="small sizes, for a smoke test")
+    parser.add_argument('--only', nargs='+', choices=CASES, help="run only these cases")
+    parser.add_argument('--threads', type=int, default=4,
+                        help=f"threads in the mixed case (1 to {MAX_MIXED_THREADS})")
+    parser.add_argument('--backend', default='native', choices=('native', 'fake'),
+                        help="'fake' runs without a server on mil_api.FakeBackend")
+    parser.add_argument('--latency-mode', default='balanced', choices=sorted(mil_api._LATENCY_MODES))
+    parser.add_argument('--output', help="result file (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument('--compare', help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+    if not 1 <= args.threads <= MAX_MIXED_THREADS:
+        parser.error(f"--threads must be between 1 and {MAX_MIXED_THREADS}.")
+
+    simulator = None
+    args.backend_instance = FakeBackend() if args.backend == 'fake' else None
+    args.simulator = args.port is None and args.backend == 'native'
+    if args.simulator:
+        args.port = _free_port()
+        simulator = _start_simulator(args.port)
+    try:
+        report = run(args)
+    finally:
+        if simulator is not None:
+            simulator.terminate()
+            simulator.wait()
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"{report['meta']['commit']}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
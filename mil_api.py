@@ -1,11 +1,25 @@
+import asyncio
 import ctypes
+import collections
+import itertools
+import json
+import logging
 import platform
+import random
 import threading
 import time
 import struct
-from typing import Optional, Union
+import math
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 import os
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the bulk array helpers
+    np = None
+
 # --- AUTO-DETECT PLATFORM AND ARCH ---
 SYSTEM = platform.system().lower()  # windows, linux, darwin
 ARCH = platform.machine().lower()    # x86_64, amd64, aarch64, arm64, etc.
@@ -26,6 +40,13 @@ elif SYSTEM == "darwin":
 else:
     raise RuntimeError(f"Unsupported operating system: {SYSTEM}")
 
+# --- LOGGING ---
+# Library messages go to the "mil_api" logger; nothing is formatted unless the
+# level is enabled. Per-call records (requests, replies) use the TRACE level.
+logger = logging.getLogger("mil_api")
+TRACE = 5
+logging.addLevelName(TRACE, "TRACE")
+
 class ApiError(Exception):
     """Base exception for API errors."""
     pass
@@ -38,21 +59,676 @@ class SendError(Exception):
     """Raised when a message send operation fails."""
     pass
 
+# --- MESSAGE PROCESSOR PACING ---
+# Per latency mode, in seconds: (interval while reads are outstanding,
+# first idle interval, longest idle interval). Idle intervals double on
+# every tick without outstanding reads until they reach the ceiling.
+_LATENCY_MODES = {
+    'low':      (0.0,    0.001, 0.005),
+    'balanced': (0.0005, 0.002, 0.05),
+    'idle':     (0.002,  0.01,  0.2),
+}
+
+class _Pacer:
+    """Decides how long a message processor sleeps between ticks."""
+    def __init__(self):
+        self.idle_interval = 0.0
+
+    def wait(self, wakeup: threading.Event, latency_mode: str, busy: bool):
+        busy_interval, idle_floor, idle_ceiling = _LATENCY_MODES[latency_mode]
+        if busy:
+            self.idle_interval = 0.0
+            if busy_interval:
+                wakeup.wait(busy_interval)
+            else:
+                time.sleep(0)  # Spin, but let other threads run
+        else:
+            # A new request sets the wakeup event, so backing off never delays the first reply
+            self.idle_interval = min(max(self.idle_interval * 2, idle_floor), idle_ceiling)
+            if wakeup.wait(self.idle_interval):
+                self.idle_interval = 0.0
+        wakeup.clear()
+
+
+# How often the message processor re-reads the native connection state (seconds)
+_STATE_CHECK_INTERVAL = 0.02
+
+# Automatic reconnect: first retry delay (seconds) and how many failed
+# attempts reuse the native handle before it is destroyed and recreated
+_RECONNECT_INITIAL_DELAY = 0.05
+_RECREATE_HANDLE_EVERY = 3
+# How long each reconnect attempt waits for the link to come up (seconds)
+_RECONNECT_ATTEMPT_WINDOW = 0.25
+
+# How long a var_type's request channel stays closed for a reply nobody waits
+# for any more (an abandoned request, or the duplicate of a re-sent one), so
+# that a late reply is not taken for the next request's (nanoseconds). An
+# abandoned request's reply is still dropped after that, for up to the
+# client's default_timeout (see Client._late).
+_LATE_REPLY_GRACE_NS = 250_000_000
+
+# --- DEADLINES ---
+# All blocking calls measure time on the monotonic clock in nanoseconds, so
+# NTP adjustments cannot stretch or cut a timeout. Timeouts are float seconds
+# (0.02 = 20 ms); None means the client's default_timeout.
+
+def _deadline_ns(timeout: float) -> int:
+    return time.monotonic_ns() + int(timeout * 1_000_000_000)
+
+
+def _remaining(deadline_ns: int) -> float:
+    """Seconds left until 'deadline_ns', never negative."""
+    return max(0, deadline_ns - time.monotonic_ns()) / 1_000_000_000
+
+
+# --- METRICS ---
+class Histogram:
+    """
+    Log-linear histogram of non-negative integers (HDR style): values below
+    16 are counted exactly, larger ones in buckets 1/8 of a power of two
+    wide, i.e. within 12.5%. Recording is a few integer operations and never
+    allocates, so it can stay on in production. Concurrent record() calls
+    are not locked; under heavy contention a rare increment may be lost.
+    """
+    _SUB_BITS = 3
+    _BUCKETS = 64 << _SUB_BITS
+
+    def __init__(self):
+        self.counts = [0] * self._BUCKETS
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int):
+        if value < 16:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - 4
+            index = (shift << 3) + (value >> shift)
+        self.counts[index] += 1
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += 1
+        self.total += value
+
+    @staticmethod
+    def _bucket_value(index: int) -> int:
+        """Midpoint of a bucket."""
+        if index < 16:
+            return index
+        shift = (index >> 3) - 1
+        low = ((index & 7) + 8) << shift
+        return low + ((1 << shift) >> 1)
+
+    def percentile(self, p: float) -> int:
+        """Value at percentile 'p' (0-100), clamped to the recorded min/max."""
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: 'Histogram'):
+        """Adds the counts of 'other', e.g. to combine per-thread histograms."""
+        if not other.count:
+            return
+        for index, count in enumerate(other.counts):
+            if count:
+                self.counts[index] += count
+        self.min = min(self.min, other.min) if self.count else other.min
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'p999': self.percentile(99.9),
+        }
+
+
+class _ClientStats:
+    """Counters and histograms behind Client.stats(). Times are in nanoseconds."""
+    def __init__(self):
+        self.reads_sent = 0
+        self.reads_joined = 0 # Served by a request already queued or on the wire
+        self.writes_sent = 0
+        self.ticks = 0
+        self.timeouts = dict.fromkeys(_VAR_TYPES, 0)
+        self.round_trip = {var_type: Histogram() for var_type in _VAR_TYPES}
+        self.lock_wait = Histogram()
+        self.replies_per_tick = Histogram()
+        self.c_calls: Dict[str, Histogram] = {}
+
+    def c_call(self, name: str) -> Histogram:
+        histogram = self.c_calls.get(name)
+        if histogram is None:
+            histogram = self.c_calls.setdefault(name, Histogram())
+        return histogram
+
+
+class _TimedLock:
+    """
+    threading.Lock that records how long each acquisition waited, and reports
+    the wait to 'on_wait(start_ns, end_ns)' when a tracer is attached.
+    """
+    __slots__ = ('_lock', '_histogram', 'on_wait')
+
+    def __init__(self, histogram: Histogram):
+        self._lock = threading.Lock()
+        self._histogram = histogram
+        self.on_wait = None
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        start = time.perf_counter_ns()
+        acquired = self._lock.acquire(blocking, timeout)
+        if acquired:
+            end = time.perf_counter_ns()
+            self._histogram.record(end - start)
+            if self.on_wait is not None:
+                self.on_wait(start, end)
+        return acquired
+
+    def release(self):
+        self._lock.release()
+
+    def locked(self) -> bool:
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._lock.release()
+
+
+# --- PLC VARIABLE TYPES ---
+# Maps each var_type accepted by the Client to its request_value enum, the
+# native getter, the ctypes result type and the "came from server" flag.
+_VAR_TYPES = {
+    'bool':  (0, 'get_bool_value',  ctypes.c_bool,   'BoolCameFromServer'),
+    'byte':  (1, 'get_byte_value',  ctypes.c_uint8,  'ByteCameFromServer'),
+    'word':  (2, 'get_word_value',  ctypes.c_uint16, 'WordCameFromServer'),
+    'dword': (3, 'get_dword_value', ctypes.c_uint32, 'DWordCameFromServer'),
+    'lword': (4, 'get_lword_value', ctypes.c_uint64, 'LWordCameFromServer'),
+}
+
+
+# Size of the native library's per-handle memory image of each var_type:
+# the getters (and reply handling) only cover addresses below these.
+_READ_LIMITS = {'bool': 0x1000, 'byte': 0x400, 'word': 0x800, 'dword': 0x200, 'lword': 0x200}
+
+
+def _check_var_type(var_type: str):
+    if var_type not in _VAR_TYPES:
+        raise ValueError(f"Invalid var_type '{var_type}'. Must be one of: 'bool', 'byte', 'word', 'dword', 'lword'.")
+
+
+def _check_read_address(address: int, var_type: str):
+    if not 0 <= address < _READ_LIMITS[var_type]:
+        raise ValueError(f"Address {address} out of range for '{var_type}' reads "
+                         f"(0 to {_READ_LIMITS[var_type] - 1}).")
+
+
+class _PendingRead:
+    """
+    Completion slot for an outstanding (var_type, address) read.
+    Queued until its var_type's request channel is free (see
+    Client._pump_reads), filled in by the message processor thread and
+    shared by every caller waiting on the same key.
+    """
+    __slots__ = ('var_type', 'address', 'waiters', 'sends', 'resend', 'sent_ns', 'write_seq',
+                 'abandoned_ns', 'event', 'value', 'error', 'callbacks')
+
+    def __init__(self, var_type: str, address: int):
+        self.var_type = var_type
+        self.address = address
+        self.waiters = 0
+        # Guarded by Client._pending_lock
+        self.sends = 0          # Requests sent for this slot
+        self.resend = False     # A caller found the request too old to join
+        self.sent_ns = 0        # perf_counter_ns of the latest request
+        self.write_seq = 0      # Client._write_seq when the latest request went out
+        self.abandoned_ns = 0   # When the last waiter left with the request on the wire
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[Exception] = None
+        self.callbacks: list = []
+
+    @property
+    def done(self) -> bool:
+        return self.event.is_set()
+
+    def complete(self, value):
+        self.value = value
+        self.event.set()
+        self._run_callbacks()
+
+    def fail(self, error: Exception):
+        self.error = error
+        self.event.set()
+        self._run_callbacks()
+
+    def add_done_callback(self, fn):
+        """Calls fn(slot) once the slot completes; immediately if it already has."""
+        self.callbacks.append(fn)
+        if self.event.is_set():
+            fn(self)
+
+    def _run_callbacks(self):
+        for fn in list(self.callbacks):
+            fn(self)
+
+
+# Precompiled codecs for reinterpreting IEEE 754 floats as PLC words
+_U32 = struct.Struct('<I')
+_F32 = struct.Struct('<f')
+_U64 = struct.Struct('<Q')
+_F64 = struct.Struct('<d')
+
+
+def _float_to_dword(value: float) -> int:
+    return _U32.unpack(_F32.pack(value))[0]
+
+
+def _dword_to_float(raw: int) -> float:
+    return _F32.unpack(_U32.pack(raw))[0]
+
+
+def _float_to_lword(value: float) -> int:
+    return _U64.unpack(_F64.pack(value))[0]
+
+
+def _lword_to_float(raw: int) -> float:
+    return _F64.unpack(_U64.pack(raw))[0]
+
+
+# NumPy dtypes matching each wire type, for read_array()
+_NUMPY_DTYPES = {'bool': 'bool', 'byte': 'uint8', 'word': 'uint16', 'dword': 'uint32', 'lword': 'uint64'}
+
+
+def _require_numpy():
+    if np is None:
+        raise ApiError("NumPy is required for array reads. Install it with 'pip install numpy'.")
+
+
+def dwords_as_floats(raw) -> 'np.ndarray':
+    """
+    Reinterprets DWORD values as 32-bit floats (REAL).
+    Zero-copy when 'raw' is already a uint32 array, e.g. from read_array().
+    """
+    _require_numpy()
+    return np.asarray(raw, dtype=np.uint32).view(np.float32)
+
+
+def lwords_as_floats(raw) -> 'np.ndarray':
+    """
+    Reinterprets LWORD values as 64-bit floats (LREAL).
+    Zero-copy when 'raw' is already a uint64 array, e.g. from read_array().
+    """
+    _require_numpy()
+    return np.asarray(raw, dtype=np.uint64).view(np.float64)
+
+
+def _encode_write(var_type: str, value) -> Union[bool, int]:
+    """
+    Validates a value for a write of 'var_type' and returns what the native
+    setter expects, applying the same rules as the individual set_*_value
+    methods (floats in a DWORD/LWORD are sent as their IEEE 754 bits).
+    """
+    if var_type == 'bool':
+        if not isinstance(value, bool): raise TypeError("Value must be a boolean.")
+        return value
+    if var_type == 'byte':
+        if not (0 <= value <= 255): raise ValueError("Byte value must be between 0 and 255.")
+        return value
+    if var_type == 'word':
+        if not (0 <= value <= 65535): raise ValueError("Word value must be between 0 and 65535.")
+        return value
+    if var_type == 'dword':
+        if isinstance(value, float):
+            return _float_to_dword(value)
+        if not isinstance(value, int): raise TypeError("Value for set_dword_value must be an int or float.")
+        if not (0 <= value <= 4294967295): raise ValueError("Integer DWord value must be between 0 and 4294967295.")
+        return value
+    if var_type == 'lword':
+        if isinstance(value, float):
+            return _float_to_lword(value)
+        if not isinstance(value, int): raise TypeError("Value for set_lword_value must be an int or float.")
+        if not (0 <= value <= (2**64 - 1)): raise ValueError("Integer LWord value out of range for uint64.")
+        return value
+    _check_var_type(var_type)
+
+
+# array typecodes used for the client-side shadow of each memory area
+_SHADOW_TYPECODES = {'bool': 'B', 'byte': 'B', 'word': 'H', 'dword': 'L', 'lword': 'Q'}
+
+
+class _ShadowMemory:
+    """
+    Client-side image of one PLC memory area: a typed array of the last
+    values received plus the monotonic time each address was updated
+    (0.0 means never read).
+    """
+    def __init__(self, var_type: str):
+        self.var_type = var_type
+        self.values = array(_SHADOW_TYPECODES[var_type])
+        self.stamps = array('d')
+
+    def store(self, address: int, value: Union[bool, int], stamp: float):
+        if address >= len(self.values):
+            grow = address + 1 - len(self.values)
+            self.values.extend([0] * grow)
+            self.stamps.extend([0.0] * grow)
+        self.values[address] = value
+        self.stamps[address] = stamp
+
+    def lookup(self, address: int, max_age: float, now: float):
+        """Returns the stored value if it is younger than max_age seconds, else None."""
+        if address >= len(self.stamps):
+            return None
+        stamp = self.stamps[address]
+        if stamp == 0.0 or now - stamp > max_age:
+            return None
+        value = self.values[address]
+        return bool(value) if self.var_type == 'bool' else value
+
+    def clear(self):
+        del self.values[:]
+        del self.stamps[:]
+
+
+class Subscription:
+    """
+    Handle returned by Client.subscribe().
+    Holds the subscribed (address, var_type) tags, the polling period and the
+    last value delivered for each tag. Call cancel() to stop delivery.
+    """
+    def __init__(self, client: 'Client', tags: Sequence[Tuple[int, str]], period_ms: int, callback):
+        self._client = client
+        self.tags = list(dict.fromkeys(tags))
+        self.period = period_ms / 1000.0
+        self.callback = callback
+        self.next_due = 0.0
+        self._last_values: Dict[Tuple[int, str], Union[bool, int]] = {}
+
+    def _deliver(self, values: Dict[Tuple[int, str], object]):
+        """Passes the tags whose value changed since the last delivery to the callback or queue."""
+        changed = {}
+        for tag in self.tags:
+            value = values.get(tag)
+            if value is None or isinstance(value, ApiError):
+                continue
+            if tag not in self._last_values or self._last_values[tag] != value:
+                changed[tag] = value
+        if not changed:
+            return
+        self._last_values.update(changed)
+        if hasattr(self.callback, 'put'):
+            self.callback.put(changed)
+        else:
+            self.callback(changed)
+
+    def cancel(self):
+        """Stops this subscription."""
+        self._client.unsubscribe(self)
+
+
+class CoalescingWriter:
+    """
+    Last-write-wins buffer in front of the Client setters, for high-rate
+    sources such as slider callbacks. Writes to the same (address, var_type)
+    are merged into the latest value and sent at most 'max_rate_hz' times per
+    second: the first write after a quiet period goes out immediately, later
+    ones are flushed together at the end of the period.
+    Create one with Client.coalescing_writer().
+    """
+    def __init__(self, client: 'Client', max_rate_hz: float = 20.0):
+        if max_rate_hz <= 0:
+            raise ValueError("max_rate_hz must be positive.")
+        self._client = client
+        self.period = 1.0 / max_rate_hz
+        self._pending: Dict[Tuple[int, str], object] = {}
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._flusher, daemon=True)
+        self._thread.start()
+
+    def set(self, address: int, var_type: str, value):
+        """
+        Queues 'value' for 'address', replacing any value not yet sent. The
+        value is validated here, so a bad one cannot fail the whole flush.
+        """
+        _check_var_type(var_type)
+        _encode_write(var_type, value)
+        if self._closed:
+            raise ApiError("CoalescingWriter is closed.")
+        with self._lock:
+            self._pending[(address, var_type)] = value
+        self._wakeup.set()
+
+    def flush(self):
+        """Sends every queued value now."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            self._client.write_many([(address, var_type, value) for (address, var_type), value in pending.items()])
+        except (ApiError, SendError, ValueError, TypeError) as e:
+            logger.error("Coalesced write failed: %s", e)
+
+    def close(self):
+        """Flushes the remaining values and stops the flusher thread."""
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=1.0)
+        self.flush()
+
+    def _flusher(self):
+        while not self._closed:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            delay = self._last_flush + self.period - time.monotonic()
+            if delay > 0 and not self._closed:
+                time.sleep(delay)
+            if self._pending:
+                self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# Engineering encodings a Tag may use, and the wire types each one allows
+_TAG_ENCODINGS = {
+    'uint':  ('bool', 'byte', 'word', 'dword', 'lword'),
+    'real':  ('dword',),
+    'lreal': ('lword',),
+    'fixed': ('byte', 'word', 'dword', 'lword'),
+}
+
+
+class Tag:
+    """
+    A named PLC variable: its address, wire type and engineering encoding.
+    'uint' passes the raw value through, 'real' is a 32-bit float carried in
+    a DWORD, 'lreal' a 64-bit float carried in an LWORD and 'fixed' a scaled
+    integer (value = raw * scale). The codec is resolved once, at creation.
+    """
+    __slots__ = ('name', 'address', 'var_type', 'encoding', 'scale', 'decode', 'encode')
+
+    def __init__(self, name: str, address: int, var_type: str, encoding: str = 'uint', scale: float = 1.0):
+        _check_var_type(var_type)
+        if encoding not in _TAG_ENCODINGS:
+            raise ValueError(f"Invalid encoding '{encoding}'. Must be one of: 'uint', 'real', 'lreal', 'fixed'.")
+        if var_type not in _TAG_ENCODINGS[encoding]:
+            raise ValueError(f"Encoding '{encoding}' cannot be carried in a '{var_type}'.")
+        if encoding == 'fixed' and not scale:
+            raise ValueError("Scale of a fixed-point tag must be non-zero.")
+
+        self.name = name
+        self.address = address
+        self.var_type = var_type
+        self.encoding = encoding
+        self.scale = scale
+
+        if encoding == 'real':
+            self.decode, self.encode = _dword_to_float, _float_to_dword
+        elif encoding == 'lreal':
+            self.decode, self.encode = _lword_to_float, _float_to_lword
+        elif encoding == 'fixed':
+            self.decode = lambda raw: raw * scale
+            self.encode = lambda value: int(round(value / scale))
+        elif var_type == 'bool':
+            self.decode = self.encode = bool
+        else:
+            self.decode = self.encode = int
+
+    def __repr__(self):
+        return f"Tag({self.name!r}, address={self.address}, var_type={self.var_type!r}, encoding={self.encoding!r})"
+
+
+class TagRegistry:
+    """
+    Named tags resolved once at startup. read() fetches a group of tags with
+    a single read_many() and decodes them; write() encodes and sends one.
+    """
+    def __init__(self, tags: Sequence[Tag] = ()):
+        self._tags: Dict[str, Tag] = {}
+        for tag in tags:
+            self._tags[tag.name] = tag
+
+    def add(self, name: str, address: int, var_type: str, encoding: str = 'uint', scale: float = 1.0) -> Tag:
+        """Creates, registers and returns a Tag."""
+        tag = Tag(name, address, var_type, encoding, scale)
+        self._tags[name] = tag
+        return tag
+
+    def __getitem__(self, name: str) -> Tag:
+        return self._tags[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._tags
+
+    def __iter__(self):
+        return iter(self._tags.values())
+
+    def __len__(self):
+        return len(self._tags)
+
+    def read(self, client: 'Client', names: Sequence[str], timeout: Optional[float] = None) -> Dict[str, object]:
+        """
+        Reads the named tags with one read_many() and returns {name: value}.
+        A tag whose read failed maps to the ApiError instead of a value.
+        """
+        tags = [self._tags[name] for name in names]
+        raws = client.read_many([(tag.address, tag.var_type) for tag in tags], timeout)
+        return {tag.name: raw if isinstance(raw, ApiError) else tag.decode(raw)
+                for tag, raw in zip(tags, raws)}
+
+    def write(self, client: 'Client', name: str, value):
+        """Encodes 'value' for the named tag and sends it."""
+        tag = self._tags[name]
+        getattr(client, f"set_{tag.var_type}_value")(tag.address, tag.encode(value))
+
+
+class _ReplyFlags:
+    """
+    The native *CameFromServer flags are globals of the library, shared by
+    every client in the process. They are only raised inside
+    process_messages(handle), which runs that handle's message callbacks
+    synchronously, so a flag raised during one client's call belongs to that
+    client. process() serializes process_messages across every client of the
+    library and returns the flags its call raised, cleared again, so a reply
+    to one controller never completes a read on another.
+    """
+    def __init__(self, backend: 'Backend'):
+        self._flags = [getattr(backend, flag_name) for (_, _, _, flag_name) in _VAR_TYPES.values()]
+        self._lock = threading.Lock()
+
+    def process(self, process_messages, handle) -> List[bool]:
+        with self._lock:
+            process_messages(handle)
+            raised = [flag.value for flag in self._flags]
+            for flag, value in zip(self._flags, raised):
+                if value:
+                    flag.value = False
+        return raised
+
+
+_reply_flags: Dict[str, _ReplyFlags] = {}
+_reply_flags_lock = threading.Lock()
+
+
+def _reply_flags_for(key, backend: 'Backend') -> _ReplyFlags:
+    with _reply_flags_lock:
+        if key not in _reply_flags:
+            _reply_flags[key] = _ReplyFlags(backend)
+        return _reply_flags[key]
+
+
 # --- CTYPES STRUCTURES ---
 # These classes must exactly mirror the C++ structs in CNCMessageStructs.h
 
 
 
 
-# This class loads the DLL and defines the function signatures.
-class _C_API:
+# --- TRANSPORT BACKENDS ---
+_BACKEND_FUNCTIONS = ('create_client', 'destroy_client', 'connect_to_server', 'disconnect_from_server',
+                      'is_connected', 'process_messages', 'request_value') + tuple(
+    f"{prefix}_{var_type}_value" for prefix in ('get', 'set') for var_type in _VAR_TYPES)
+
+
+class Backend:
+    """
+    Transport behind a Client: the native library's C functions, called with
+    the native signatures, plus its reply flags.
+
+        create_client() -> handle          destroy_client(handle)
+        connect_to_server(handle, host: bytes, port) -> bool
+        disconnect_from_server(handle)     is_connected(handle) -> bool
+        process_messages(handle)           request_value(handle, address, type_enum) -> bool
+        get_<type>_value(handle, address, byref(c_value)) -> bool
+        set_<type>_value(handle, address, value) -> bool
+        BoolCameFromServer ... LWordCameFromServer: objects with a bool 'value'
+
+    The flags are raised only inside process_messages(handle), for replies
+    to that handle. Clients whose backends have the same 'flags_key' share
+    the reply flags, and their process_messages calls are serialized.
+    """
+    flags_key: object = None
+
+
+class CtypesBackend(Backend):
+    """The native library, loaded with ctypes. Calls go straight to the C functions."""
     def __init__(self, lib_path: str):
         try:
             self.lib = ctypes.CDLL(lib_path)
         except OSError as e:
             raise ApiError(f"Failed to load library at '{lib_path}'. "
                            f"Ensure the library exists and all dependencies are available. Error: {e}")
+        self.flags_key = lib_path
         self._define_signatures()
+        for name in _BACKEND_FUNCTIONS:
+            setattr(self, name, getattr(self.lib, name))
 
     def _define_signatures(self):
         # --- Lifecycle ---
@@ -66,8 +742,16 @@ class _C_API:
         self.lib.is_connected.argtypes = [ctypes.c_void_p]
         self.lib.is_connected.restype = ctypes.c_bool
 
+        self.lib.disconnect_from_server.restype = None
+        self.lib.destroy_client.restype = None
+
         # --- Message Processing ---
         self.lib.process_messages.argtypes = [ctypes.c_void_p]
+        self.lib.process_messages.restype = None
+
+        # --- Value Requests (var_type enum: 0 bool .. 4 lword) ---
+        self.lib.request_value.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_int]
+        self.lib.request_value.restype = ctypes.c_bool # False when the link is down
 
 
         # --- Data Getters ---
@@ -106,6 +790,181 @@ class _C_API:
         self.WordCameFromServer = ctypes.c_bool.in_dll(self.lib, "WordCameFromServer")
         self.DWordCameFromServer = ctypes.c_bool.in_dll(self.lib, "DWordCameFromServer")
         self.LWordCameFromServer = ctypes.c_bool.in_dll(self.lib, "LWordCameFromServer")
+
+
+_FAKE_TYPECODES = {'bool': 'B', 'byte': 'B', 'word': 'H', 'dword': 'I', 'lword': 'Q'}
+_FAKE_MEMORY_SIZE = 0x10000 # Controller memory; requests carry a u32 address
+_FAKE_MAX_WRITE_ADDRESS = 0xFFFE # Set messages carry a u16 address; the library refuses 0xFFFF
+_fake_backend_ids = itertools.count(1) # flags_key must not be reused, unlike id()
+
+
+class FakeBackend(Backend):
+    """
+    In-process controller, for tests and benchmarks without sockets or the
+    native library. It behaves like the native client where Client relies
+    on it:
+
+    - every handle has its own memory image per var_type, sized as the
+      library's (_READ_LIMITS), and the getters copy from it whenever the
+      link is up and the address is in range, whether or not a reply came;
+    - request_value() returns False when not connected; otherwise the
+      controller samples its memory and the reply is applied to the image,
+      and the type's flag raised, by a later process_messages() call on
+      that handle, once 'latency' seconds (per host in 'host_latency') have
+      passed; replies outside the image are dropped;
+    - setters refuse addresses above 0xFFFE.
+
+    Clients sharing one instance talk to the same controller memory; poke()
+    changes it as the PLC program would. Setting 'online' to False refuses
+    new connections, drop() cuts existing ones, and lose_requests(n) makes
+    the controller ignore the next n requests.
+    """
+    def __init__(self, latency: float = 0.0):
+        self.flags_key = ('fake', next(_fake_backend_ids))
+        self.online = True
+        self.latency = latency
+        self.host_latency: Dict[str, float] = {}
+        self.memory = {var_type: array(code, bytes(_FAKE_MEMORY_SIZE * array(code).itemsize))
+                       for var_type, code in _FAKE_TYPECODES.items()}
+        self._memories = [self.memory[var_type] for var_type in _VAR_TYPES]
+        self._handles = itertools.count(1)
+        self._connected: Dict[int, bool] = {}
+        self._latency_ns: Dict[int, int] = {}
+        self._images: Dict[int, List[array]] = {}
+        self._outbound: Dict[int, collections.deque] = {} # handle -> (due_ns, type_enum, address, value)
+        self._lose = 0
+        for type_enum, (var_type, (_, getter_name, _, flag_name)) in enumerate(_VAR_TYPES.items()):
+            setattr(self, flag_name, ctypes.c_bool())
+            setattr(self, getter_name, self._getter(type_enum, _READ_LIMITS[var_type]))
+            setattr(self, f"set_{var_type}_value", self._setter(self.memory[var_type]))
+        self._flags = [getattr(self, flag_name) for (_, _, _, flag_name) in _VAR_TYPES.values()]
+
+    def peek(self, var_type: str, address: int) -> Union[bool, int]:
+        _check_var_type(var_type)
+        value = self.memory[var_type][address]
+        return bool(value) if var_type == 'bool' else value
+
+    def poke(self, var_type: str, address: int, value: Union[bool, int]):
+        _check_var_type(var_type)
+        self.memory[var_type][address] = int(value)
+
+    def drop(self):
+        """Cuts every connection, as if the controller went away."""
+        for handle in self._connected:
+            self._connected[handle] = False
+            self._outbound[handle].clear()
+
+    def lose_requests(self, count: int = 1):
+        """The next 'count' requests get no reply, as if lost on the way."""
+        self._lose += count
+
+    def create_client(self) -> int:
+        handle = next(self._handles)
+        self._connected[handle] = False
+        self._latency_ns[handle] = 0
+        self._images[handle] = [array(code, bytes(_READ_LIMITS[var_type] * array(code).itemsize))
+                                for var_type, code in _FAKE_TYPECODES.items()]
+        self._outbound[handle] = collections.deque()
+        return handle
+
+    def destroy_client(self, handle: int):
+        for table in (self._connected, self._latency_ns, self._images, self._outbound):
+            table.pop(handle, None)
+
+    def connect_to_server(self, handle: int, host: bytes, port: int) -> bool:
+        latency = self.host_latency.get(host.decode(), self.latency)
+        self._latency_ns[handle] = int(latency * 1e9)
+        self._outbound[handle].clear()
+        self._connected[handle] = self.online
+        return True
+
+    def disconnect_from_server(self, handle: int):
+        self._connected[handle] = False
+        self._outbound[handle].clear()
+
+    def is_connected(self, handle: int) -> bool:
+        return self._connected.get(handle, False)
+
+    def process_messages(self, handle: int):
+        outbound = self._outbound.get(handle)
+        if not outbound:
+            return
+        now = time.monotonic_ns()
+        images = self._images[handle]
+        while outbound and outbound[0][0] <= now:
+            _, type_enum, address, value = outbound.popleft()
+            image = images[type_enum]
+            if address < len(image): # The library drops replies outside its image
+                image[address] = value
+                self._flags[type_enum].value = True
+
+    def request_value(self, handle: int, address: int, type_enum: int) -> bool:
+        if not self._connected.get(handle):
+            return False
+        if self._lose:
+            self._lose -= 1
+            return True
+        memory = self._memories[type_enum]
+        value = memory[address] if address < _FAKE_MEMORY_SIZE else 0
+        self._outbound[handle].append((time.monotonic_ns() + self._latency_ns[handle], type_enum, address, value))
+        return True
+
+    def _getter(self, type_enum: int, limit: int):
+        connected, images = self._connected, self._images
+        def get_value(handle, address, result_ref) -> bool:
+            if not connected.get(handle) or address >= limit:
+                return False
+            result_ref._obj.value = images[handle][type_enum][address]
+            return True
+        return get_value
+
+    def _setter(self, memory: array):
+        connected = self._connected
+        mask = (1 << (8 * memory.itemsize)) - 1
+        def set_value(handle, address, value) -> bool:
+            if not connected.get(handle) or address > _FAKE_MAX_WRITE_ADDRESS:
+                return False
+            memory[address] = int(value) & mask
+            return True
+        return set_value
+
+
+class RecordingBackend(Backend):
+    """
+    Wraps another backend and appends every call to 'calls' as
+    (perf_counter_ns, name, args, result), without the handle argument.
+    Getters record the value read (None if there was none). The per-tick
+    process_messages and is_connected calls are left out unless 'exclude'
+    says otherwise.
+    """
+    def __init__(self, inner: Backend, exclude: Sequence[str] = ('process_messages', 'is_connected')):
+        self.inner = inner
+        self.flags_key = inner.flags_key
+        self.calls: List[tuple] = []
+        for (_, _, _, flag_name) in _VAR_TYPES.values():
+            setattr(self, flag_name, getattr(inner, flag_name))
+        for name in _BACKEND_FUNCTIONS:
+            function = getattr(inner, name)
+            setattr(self, name, function if name in exclude else self._recorder(name, function))
+
+    def _recorder(self, name: str, function):
+        calls = self.calls
+        if name.startswith('get_'):
+            def call(handle, address, result_ref):
+                found = function(handle, address, result_ref)
+                calls.append((time.perf_counter_ns(), name, (address,), result_ref._obj.value if found else None))
+                return found
+        else:
+            def call(*args):
+                result = function(*args)
+                calls.append((time.perf_counter_ns(), name, args[1:], result))
+                return result
+        return call
+
+    def clear(self):
+        del self.calls[:]
+
+
 # --- Main Python Client Class ---
 class Client:
     """
@@ -113,144 +972,468 @@ class Client:
     This client operates asynchronously, using a background thread
     to process incoming messages from the server.
     """
-    def __init__(self, lib_path: str = LIB_NAME):
-        # Try to find the library relative to this script file
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        # Check if lib_path is absolute, if not, join with script_dir
-        if not os.path.isabs(lib_path):
-            lib_path = os.path.join(script_dir, lib_path)
-            
-        self._api = _C_API(lib_path)
-        self.client_handle = self._api.lib.create_client()
+    def __init__(self, lib_path: str = LIB_NAME, latency_mode: str = 'balanced',
+                 wakeup: Optional[threading.Event] = None,
+                 auto_reconnect: bool = False, reconnect_max_delay: float = 0.75,
+                 default_timeout: float = 2.0, backend: Optional[Backend] = None):
+        if backend is None:
+            # Try to find the library relative to this script file
+            script_dir = os.path.dirname(os.path.abspath(__file__))
+            # Check if lib_path is absolute, if not, join with script_dir
+            if not os.path.isabs(lib_path):
+                lib_path = os.path.join(script_dir, lib_path)
+            backend = CtypesBackend(lib_path)
+
+        self._backend = backend
+        self.client_handle = self._backend.create_client()
         if not self.client_handle:
             raise ApiError("Failed to create client instance from library.")
         
-        self._is_connected_flag = False # Internal flag, distinct from C is_connected
+        # Connection state maintained by the message processor thread. Hot paths
+        # read the flag without locking; listeners are told about changes.
+        self.default_timeout = default_timeout # Seconds, for reads called without a timeout
+        self._is_connected_flag = False
+        self._connected_event = threading.Event()
+        self._connection_listeners: list = []
+        self._state_lock = threading.Lock() # Serializes state transitions only
+        # Held by the processor tick and by handle recreation during reconnect,
+        # so the native handle is never swapped under process_messages.
+        self._handle_lock = threading.RLock()
+        # Automatic reconnect after an unexpected drop
+        self.auto_reconnect = auto_reconnect
+        self.reconnect_max_delay = reconnect_max_delay
+        self.reconnect_count = 0
+        self._host: Optional[str] = None
+        self._port: Optional[int] = None
+        self._reconnect_thread: Optional[threading.Thread] = None
         self._processing_thread: Optional[threading.Thread] = None
         self._stop_event = threading.Event()
-        self._lock = threading.Lock() # Protects client_handle and _is_connected_flag
-        print("INFO: Client instance created.")
+        self._stats = _ClientStats()
+        self._lock = _TimedLock(self._stats.lock_wait) # Protects client_handle
+        # Writes sent so far (under _lock), and each thread's latest one: a
+        # read must not join a request that went out before its own write
+        self._write_seq = 0
+        self._thread_writes = threading.local()
+        # Tracing hooks, all None (and free) unless a tracer is attached. Times
+        # are time.perf_counter_ns(); each hook runs on the thread doing the work.
+        #   on_request(var_type, address, sent_ns)
+        #   on_reply(var_type, address, value, sent_ns, received_ns)
+        #   on_send(var_type, address, raw_value, sent_ns)
+        #   on_span(name, start_ns, end_ns): lock waits, C calls, waits, ticks
+        self.on_request = None
+        self.on_reply = None
+        self.on_send = None
+        self._on_span = None
+        # Outstanding reads keyed by (var_type, address). Only the message
+        # processor thread reads and clears the native *CameFromServer flags.
+        # The library raises one flag per var_type and its getters return the
+        # handle's memory image whether or not a reply has arrived, so a reply
+        # can only be attributed to a request that is alone on the wire: each
+        # var_type has one request in flight (_inflight) and the other reads
+        # of that type wait in _queued. A re-sent request leaves duplicate
+        # replies behind (_stray), ignored until _quiet_until (perf_counter_ns).
+        # A request given up on frees its channel after _LATE_REPLY_GRACE_NS,
+        # but its reply is owed (_late) until _late_until: a flag raised
+        # meanwhile is dropped. All guarded by _pending_lock.
+        self._pending: dict = {}
+        self._inflight: List[Optional[_PendingRead]] = [None] * len(_VAR_TYPES)
+        self._queued = [collections.deque() for _ in _VAR_TYPES]
+        self._stray = [0] * len(_VAR_TYPES)
+        self._quiet_until = [0] * len(_VAR_TYPES)
+        self._late = [0] * len(_VAR_TYPES)
+        self._late_until = [0] * len(_VAR_TYPES)
+        self._pending_lock = threading.Lock()
+        # Kicks the message processor out of its idle sleep. A Fleet passes in
+        # the event of the worker thread that services this client.
+        self._wakeup = wakeup or threading.Event()
+        self._fleet: Optional['Fleet'] = None
+        self._last_state_check = 0.0
+        self._connecting = False # Set while connect() waits; the processor then checks state every tick
+        self.latency_mode = latency_mode
+        # Per-type dispatch tables, resolved once: native function, its name and
+        # its c_call histogram (rebound by reset_stats). The result buffers are
+        # only touched by the message processor thread, which does all native reads.
+        self._setters = {}
+        self._readers = []
+        for var_type, (_, getter_name, c_type, _) in _VAR_TYPES.items():
+            setter_name = f"set_{var_type}_value"
+            self._setters[var_type] = (getattr(self._backend, setter_name), setter_name,
+                                       self._stats.c_call(setter_name))
+            result = c_type()
+            self._readers.append((var_type, getattr(self._backend, getter_name), getter_name,
+                                  self._stats.c_call(getter_name), result, ctypes.byref(result)))
+        self._reply_flags = _reply_flags_for(self._backend.flags_key, self._backend)
+        # Last value and receive time of every address read, per var_type
+        self._shadow = {var_type: _ShadowMemory(var_type) for var_type in _VAR_TYPES}
+        self._shadow_lock = threading.Lock()
+        # Periodic subscriptions, all serviced by one lazily started poller thread
+        self._subscriptions: List[Subscription] = []
+        self._subs_lock = threading.Lock()
+        self._subs_changed = threading.Event()
+        self._subs_thread: Optional[threading.Thread] = None
+        logger.info("Client instance created.")
 
 
-    def connect(self, host: str, port: int, timeout: int = 5):
+    def connect(self, host: str, port: int, timeout: float = 5):
         """
         Initiates a connection to the server and starts a background
         thread to process messages.
         """
         if self._is_connected_flag:
-            print("WARN: Already connected.")
+            logger.warning("Already connected.")
             return
 
         with self._lock:
             if self._is_connected_flag: # Double check after acquiring lock
-                print("WARN: Already connected (race condition avoided).")
+                logger.warning("Already connected (race condition avoided).")
                 return
 
+            # A previous disconnect() destroys the handle; start over with a fresh one
+            if not self.client_handle:
+                self.client_handle = self._backend.create_client()
+                if not self.client_handle:
+                    raise ApiError("Failed to create client instance from library.")
+            self._host, self._port = host, port
+
             # The C++ function starts the connection attempt
             # connect_to_server itself might be asynchronous in C++
-            self._api.lib.connect_to_server(self.client_handle, host.encode('utf-8'), port)
+            self._backend.connect_to_server(self.client_handle, host.encode('utf-8'), port)
 
-            # Start the background message processor
+            # Start the background message processor, unless a Fleet worker services
+            # this client or the processor survived a dropped link and is still running
             self._stop_event.clear()
-            self._processing_thread = threading.Thread(target=self._message_processor)
-            self._processing_thread.daemon = True # Allow program to exit even if thread is running
-            self._processing_thread.start()
-
-            # Wait for the connection to be confirmed by is_connected
-            start_time = time.time()
-            while not self._api.lib.is_connected(self.client_handle):
-                if time.time() - start_time > timeout:
-                    print(f"ERROR: Connection to {host}:{port} timed out after {timeout} seconds.")
-                    self._stop_event.set()
-                    if self._processing_thread and self._processing_thread.is_alive():
-                        self._processing_thread.join(timeout=1.0)
-                    # No destroy_client here as disconnect() handles it.
-                    # We don't call full disconnect as client_handle might be in a weird state.
-                    raise ConnectionError(f"Connection to {host}:{port} timed out after {timeout} seconds.")
-                if self._stop_event.is_set(): # If disconnect called from another thread
-                    raise ConnectionError("Connection attempt aborted.")
-                time.sleep(0.1)
-            
-            self._is_connected_flag = True
-            print(f"INFO: Successfully connected to {host}:{port} and message processor started.")
+            if self._fleet is None and not (self._processing_thread and self._processing_thread.is_alive()):
+                self._processing_thread = threading.Thread(target=self._message_processor)
+                self._processing_thread.daemon = True # Allow program to exit even if thread is running
+                self._processing_thread.start()
+
+            # Wait for the message processor to see the connection come up. It checks
+            # the native state on every tick while connecting and sets _connected_event.
+            deadline = _deadline_ns(timeout)
+            self._connecting = True
+            self._wakeup.set()
+            try:
+                while not self._connected_event.wait(min(0.1, _remaining(deadline))):
+                    if time.monotonic_ns() >= deadline:
+                        logger.error("Connection to %s:%s timed out after %s seconds.", host, port, timeout)
+                        self._stop_event.set()
+                        if self._processing_thread and self._processing_thread.is_alive():
+                            self._processing_thread.join(timeout=1.0)
+                        # No destroy_client here as disconnect() handles it.
+                        # We don't call full disconnect as client_handle might be in a weird state.
+                        raise ConnectionError(f"Connection to {host}:{port} timed out after {timeout} seconds.")
+                    if self._stop_event.is_set(): # If disconnect called from another thread
+                        raise ConnectionError("Connection attempt aborted.")
+            finally:
+                self._connecting = False
+            self._rearm_subscriptions()
+            logger.info("Successfully connected to %s:%s and message processor started.", host, port)
+
 
+    @property
+    def backend(self) -> Backend:
+        return self._backend
+
+    @property
+    def latency_mode(self) -> str:
+        """
+        Pacing of the message processor: 'low' spins while reads are
+        outstanding, 'balanced' polls every 0.5ms, 'idle' every 2ms. With
+        nothing outstanding all modes back off exponentially (up to 5ms,
+        50ms and 200ms respectively).
+        """
+        return self._latency_mode
+
+    @latency_mode.setter
+    def latency_mode(self, mode: str):
+        if mode not in _LATENCY_MODES:
+            raise ValueError(f"Invalid latency_mode '{mode}'. Must be one of: 'low', 'balanced', 'idle'.")
+        self._latency_mode = mode
+        self._wakeup.set()
 
     def _message_processor(self):
         """Target for the background thread. Continuously polls the C++ library."""
-        print("INFO: Message processing thread started.")
+        logger.info("Message processing thread started.")
+        pacer = _Pacer()
         while not self._stop_event.is_set():
+            busy = self._process_once()
+            pacer.wait(self._wakeup, self._latency_mode, busy)
+        logger.info("Message processing thread stopped.")
+
+    def _process_once(self) -> bool:
+        """
+        One message processor tick: pumps the native queue, applies replies
+        and periodically refreshes the connection state. Returns True while
+        reads are outstanding. Called by this client's own thread, or by a
+        Fleet worker when the client is part of a Fleet.
+        """
+        with self._handle_lock:
             if self.client_handle:
-                self._api.lib.process_messages(self.client_handle)
-            time.sleep(0.01) # 10ms loop, adjust as needed
-        print("INFO: Message processing thread stopped.")
+                stats = self._stats
+                start = time.perf_counter_ns()
+                raised = self._reply_flags.process(self._backend.process_messages, self.client_handle)
+                processed = time.perf_counter_ns()
+                stats.c_call('process_messages').record(processed - start)
+                stats.replies_per_tick.record(self._dispatch_replies(raised))
+                if self._channels_ready():
+                    sent = stats.reads_sent
+                    self._pump_reads(blocking=False)
+                    if stats.reads_sent != sent:
+                        # Tick again without the pacer's wait, as after a caller's request
+                        self._wakeup.set()
+                stats.ticks += 1
+                now = time.monotonic()
+                if self._connecting or now - self._last_state_check >= _STATE_CHECK_INTERVAL:
+                    self._last_state_check = now
+                    self._set_connected(bool(self._backend.is_connected(self.client_handle)))
+                span = self._on_span
+                if span is not None:
+                    span('process_messages', start, processed)
+                    span('tick', start, time.perf_counter_ns())
+        return bool(self._pending) or self._connecting
+
+    def _dispatch_replies(self, raised: List[bool]):
+        """
+        Completes the in-flight read of every var_type whose reply flag this
+        client's process_messages call raised (see _ReplyFlags), reading the
+        value for that read's address only. Runs on the message processor
+        thread only. Returns the number of replies applied.
+        """
+        replied = []
+        with self._pending_lock:
+            now = time.perf_counter_ns()
+            for index, flag in enumerate(raised):
+                if not flag:
+                    continue
+                slot = self._inflight[index]
+                if self._late[index]:
+                    if now < self._late_until[index]:
+                        # Maybe the late reply of an abandoned request: drop it, and
+                        # re-send the read in flight in case the flag was its own
+                        self._late[index] -= 1
+                        if slot is not None:
+                            slot.resend = True
+                        continue
+                    self._late[index] = 0
+                if slot is None:
+                    # Duplicate reply to a re-sent request, or one nobody waits for any more
+                    if self._stray[index]:
+                        self._stray[index] -= 1
+                    continue
+                self._inflight[index] = None
+                if slot.sends > 1:
+                    self._stray[index] = slot.sends - 1
+                    self._quiet_until[index] = now + _LATE_REPLY_GRACE_NS
+                replied.append((index, slot))
+        if not replied:
+            return 0
+
+        trace = logger.isEnabledFor(TRACE)
+        handle = self.client_handle
+        span, on_reply = self._on_span, self.on_reply
+        for index, slot in replied:
+            var_type, getter, getter_name, histogram, result, result_ref = self._readers[index]
+            start = time.perf_counter_ns()
+            found = getter(handle, slot.address, result_ref)
+            end = time.perf_counter_ns()
+            histogram.record(end - start)
+            if span is not None:
+                span(getter_name, start, end)
+            if not found:
+                slot.fail(ApiError(f"Reply for {var_type} address {slot.address} could not be read."))
+                continue
+            value = result.value
+            self._stats.round_trip[var_type].record(end - slot.sent_ns)
+            if on_reply is not None:
+                on_reply(var_type, slot.address, value, slot.sent_ns, end)
+            with self._shadow_lock:
+                self._shadow[var_type].store(slot.address, value, time.monotonic())
+            slot.complete(value)
+            if trace:
+                logger.log(TRACE, "Reply %s[%s] = %s", var_type, slot.address, value)
+        return len(replied)
 
     def disconnect(self):
         """Disconnects from the server and cleans up resources."""
         if not self.client_handle:
             return
 
-        print("INFO: Disconnecting...")
+        logger.info("Disconnecting...")
         self._stop_event.set() # Signal thread to stop
-        if self._processing_thread and self._processing_thread.is_alive():
+        self._wakeup.set()
+        self._subs_changed.set()
+        # Connection listeners run on the processor (or reconnect) thread, and
+        # may call disconnect() from there: that thread exits on _stop_event by
+        # itself, and the only lock it holds, _handle_lock, is reentrant.
+        current = threading.current_thread()
+        if self._processing_thread and self._processing_thread.is_alive() \
+                and self._processing_thread is not current:
             self._processing_thread.join(timeout=2.0) # Wait for thread to finish
+        if self._fleet is not None:
+            self._fleet._detach(self)
+        if self._reconnect_thread and self._reconnect_thread.is_alive() \
+                and self._reconnect_thread is not current:
+            self._reconnect_thread.join(timeout=2.0)
 
-        with self._lock:
+        with self._handle_lock, self._lock:
             if not self.client_handle: return # Check again in case of race condition
-            self._api.lib.disconnect_from_server(self.client_handle)
-            self._api.lib.destroy_client(self.client_handle)
+            self._backend.disconnect_from_server(self.client_handle)
+            self._backend.destroy_client(self.client_handle)
             self.client_handle = None
-            self._is_connected = False
+        self._set_connected(False)
+        self._fail_pending("Client disconnected while waiting for value.")
         
-        print("INFO: Client disconnected and destroyed.")
+        logger.info("Client disconnected and destroyed.")
         
     def is_connected(self) -> bool:
-        """Checks if the client believes it is connected."""
-        # Check both Python flag and C-layer, prioritizing Python flag if recently disconnected
-        with self._lock:
-            if not self.client_handle or not self._is_connected_flag:
-                return False
-            # If Python flag is true, re-verify with C-layer
-            self._is_connected_flag = self._api.lib.is_connected(self.client_handle)
-            return self._is_connected_flag
+        """
+        Checks if the client believes it is connected.
+        Lock-free: the state is kept current by the message processor thread.
+        """
+        return self._is_connected_flag and self.client_handle is not None
+
+    def wait_until_connected(self, timeout: Optional[float] = None) -> bool:
+        """Blocks until the connection is up; returns False on timeout."""
+        return self._connected_event.wait(timeout)
+
+    def add_connection_listener(self, callback):
+        """
+        Registers callback(connected: bool), called whenever the connection
+        state changes. Called from the thread that observed the change.
+        """
+        self._connection_listeners.append(callback)
+
+    def remove_connection_listener(self, callback):
+        if callback in self._connection_listeners:
+            self._connection_listeners.remove(callback)
+
+    def _set_connected(self, state: bool):
+        """Updates the connection flag and notifies listeners on a change."""
+        if state == self._is_connected_flag:
+            return
+        with self._state_lock:
+            if state == self._is_connected_flag:
+                return
+            self._is_connected_flag = state
+            if state:
+                self._connected_event.set()
+            else:
+                self._connected_event.clear()
+        logger.info("Connection state changed: %s.", "connected" if state else "disconnected")
+        for callback in list(self._connection_listeners):
+            try:
+                callback(state)
+            except Exception as e:
+                logger.error("Connection listener raised: %s", e)
+
+        if not state and not self._stop_event.is_set():
+            # Unexpected drop: outstanding replies will never arrive
+            self._fail_pending("Connection lost while waiting for value.")
+            if self.auto_reconnect and self._host is not None:
+                self._start_reconnect()
+
+    def _fail_pending(self, message: str):
+        """Fails every outstanding read and resets the request channels."""
+        with self._pending_lock:
+            slots = set(self._pending.values())
+            for index, queue in enumerate(self._queued):
+                slots.update(queue)
+                queue.clear()
+                if self._inflight[index] is not None:
+                    slots.add(self._inflight[index])
+                self._inflight[index] = None
+                self._stray[index] = 0
+                self._late[index] = 0
+        for slot in slots:
+            if not slot.done:
+                slot.fail(ConnectionError(message))
+
+    def _start_reconnect(self):
+        with self._state_lock:
+            if self._reconnect_thread and self._reconnect_thread.is_alive():
+                return
+            self._reconnect_thread = threading.Thread(target=self._reconnect_loop, daemon=True)
+            self._reconnect_thread.start()
+
+    def _reconnect_loop(self):
+        """
+        Re-establishes a dropped link with jittered exponential backoff, capped
+        at reconnect_max_delay. The native handle is reused, and destroyed and
+        recreated every few failed attempts in case it is wedged. On success
+        the shadow memory is invalidated and subscriptions are re-armed.
+        """
+        delay = _RECONNECT_INITIAL_DELAY
+        attempt = 0
+        logger.warning("Connection to %s:%s lost; reconnecting.", self._host, self._port)
+        while self.auto_reconnect and not self._stop_event.is_set() and not self._is_connected_flag:
+            attempt += 1
+            with self._handle_lock, self._lock:
+                if self._stop_event.is_set():
+                    break
+                if self.client_handle:
+                    self._backend.disconnect_from_server(self.client_handle)
+                    if attempt % _RECREATE_HANDLE_EVERY == 0:
+                        self._backend.destroy_client(self.client_handle)
+                        self.client_handle = None
+                if not self.client_handle:
+                    self.client_handle = self._backend.create_client()
+                if self.client_handle:
+                    self._backend.connect_to_server(self.client_handle, self._host.encode('utf-8'), self._port)
+                    self._connecting = True
+            if self.client_handle:
+                self._wakeup.set()
+                connected = self._connected_event.wait(_RECONNECT_ATTEMPT_WINDOW)
+                self._connecting = False
+                if connected:
+                    break
+            logger.info("Reconnect attempt %d to %s:%s failed.", attempt, self._host, self._port)
+            self._stop_event.wait(delay * random.uniform(0.5, 1.0))
+            delay = min(delay * 2, self.reconnect_max_delay)
+
+        if self._is_connected_flag and not self._stop_event.is_set():
+            self.reconnect_count += 1
+            self.invalidate_cache()
+            self._rearm_subscriptions()
+            logger.info("Reconnected to %s:%s after %d attempt(s).", self._host, self._port, attempt)
     
-    def set_bool_value(self, address: int, value: bool):
-        """Sets a boolean value in the PLC's shared memory via UserDefinedBool message."""
+    def _send_write(self, var_type: str, address: int, value):
+        """Validates, encodes and sends one write through the setter table."""
         if not self.is_connected(): raise ConnectionError("Not connected.")
-        if not isinstance(value, bool): raise TypeError("Value must be a boolean.")
-        
+        raw = _encode_write(var_type, value)
+        setter, setter_name, histogram = self._setters[var_type]
+
         with self._lock:
             if not self.client_handle: raise ConnectionError("Client handle destroyed.")
-            success = self._api.lib.set_bool_value(self.client_handle, ctypes.c_uint32(address), ctypes.c_bool(value))
+            self._write_seq += 1
+            self._thread_writes.seq = self._write_seq
+            start = time.perf_counter_ns()
+            success = setter(self.client_handle, address, raw)
+            end = time.perf_counter_ns()
+            histogram.record(end - start)
+            # Read the native state while the handle is guaranteed to be alive:
+            # once _lock is released the reconnect loop may destroy it
+            link_up = success or bool(self._backend.is_connected(self.client_handle))
+        self._stats.writes_sent += 1
+        if self._on_span is not None:
+            self._on_span(setter_name, start, end)
+        if self.on_send is not None:
+            self.on_send(var_type, address, raw, end)
         if not success:
-            if not self._api.lib.is_connected(self.client_handle): self._is_connected_flag = False
-            raise SendError(f"Failed to set boolean value at address {address}.")
-        print(f"INFO: set_bool_value(address={address}, value={value}) sent.")
+            if not link_up: self._set_connected(False)
+            raise SendError(f"Failed to set {var_type} value at address {address}.")
+        logger.debug("set_%s_value(address=%s, value=%s -> %s) sent.", var_type, address, value, raw)
+
+    def set_bool_value(self, address: int, value: bool):
+        """Sets a boolean value in the PLC's shared memory via UserDefinedBool message."""
+        self._send_write('bool', address, value)
 
     def set_byte_value(self, address: int, value: int):
         """Sets a byte value (0-255) in the PLC's shared memory."""
-        if not self.is_connected(): raise ConnectionError("Not connected.")
-        if not (0 <= value <= 255): raise ValueError("Byte value must be between 0 and 255.")
-
-        with self._lock:
-            if not self.client_handle: raise ConnectionError("Client handle destroyed.")
-            success = self._api.lib.set_byte_value(self.client_handle, ctypes.c_uint32(address), ctypes.c_uint8(value))
-        if not success:
-            if not self._api.lib.is_connected(self.client_handle): self._is_connected_flag = False
-            raise SendError(f"Failed to set byte value at address {address}.")
-        print(f"INFO: set_byte_value(address={address}, value={value}) sent.")
+        self._send_write('byte', address, value)
 
     def set_word_value(self, address: int, value: int):
         """Sets a word value (0-65535) in the PLC's shared memory."""
-        if not self.is_connected(): raise ConnectionError("Not connected.")
-        if not (0 <= value <= 65535): raise ValueError("Word value must be between 0 and 65535.")
-        
-        with self._lock:
-            if not self.client_handle: raise ConnectionError("Client handle destroyed.")
-            success = self._api.lib.set_word_value(self.client_handle, ctypes.c_uint32(address), ctypes.c_uint16(value))
-        if not success:
-            if not self._api.lib.is_connected(self.client_handle): self._is_connected_flag = False
-            raise SendError(f"Failed to set word value at address {address}.")
-        print(f"INFO: set_word_value(address={address}, value={value}) sent.")
+        self._send_write('word', address, value)
 
     def set_dword_value(self, address: int, value: Union[int, float]):
         """
@@ -259,29 +1442,7 @@ class Client:
         If 'value' is a float, its 32-bit IEEE 754 representation is
         reinterpreted as a uint32_t and sent.
         """
-        if not self.is_connected(): raise ConnectionError("Not connected.")
-
-        actual_uint32_value: int
-        if isinstance(value, float):
-            # Reinterpret float bits as uint32
-            # 'f' is for C float (typically 32-bit), 'I' is for C unsigned int (typically 32-bit)
-            packed_float = struct.pack('f', value)
-            actual_uint32_value = struct.unpack('I', packed_float)[0]
-            print(f"INFO: Reinterpreting float {value} as uint32_t: {actual_uint32_value} (0x{actual_uint32_value:08X}) for address {address}")
-        elif isinstance(value, int):
-            if not (0 <= value <= 4294967295):
-                raise ValueError("Integer DWord value must be between 0 and 4294967295.")
-            actual_uint32_value = value
-        else:
-            raise TypeError("Value for set_dword_value must be an int or float.")
-
-        with self._lock:
-            if not self.client_handle: raise ConnectionError("Client handle destroyed.")
-            success = self._api.lib.set_dword_value(self.client_handle, ctypes.c_uint32(address), ctypes.c_uint32(actual_uint32_value))
-        if not success:
-            if not self._api.lib.is_connected(self.client_handle): self._is_connected_flag = False
-            raise SendError(f"Failed to set dword value at address {address}.")
-        print(f"INFO: set_dword_value(address={address}, value={value} -> uint32:{actual_uint32_value}) sent.")
+        self._send_write('dword', address, value)
 
     def set_lword_value(self, address: int, value: Union[int, float]):
         """
@@ -290,134 +1451,499 @@ class Client:
         If 'value' is a float (Python float is typically a C double), its 64-bit
         IEEE 754 representation is reinterpreted as a uint64_t and sent.
         """
-        if not self.is_connected(): raise ConnectionError("Not connected.")
+        self._send_write('lword', address, value)
 
-        actual_uint64_value: int
-        if isinstance(value, float):
-            # Reinterpret double (Python float) bits as uint64
-            # 'd' is for C double (typically 64-bit), 'Q' is for C unsigned long long (typically 64-bit)
-            packed_double = struct.pack('d', value)
-            actual_uint64_value = struct.unpack('Q', packed_double)[0]
-            print(f"INFO: Reinterpreting float (double) {value} as uint64_t: {actual_uint64_value} (0x{actual_uint64_value:016X}) for address {address}")
-        elif isinstance(value, int):
-            if not (0 <= value <= (2**64 - 1)):
-                raise ValueError("Integer LWord value out of range for uint64.")
-            actual_uint64_value = value
-        else:
-            raise TypeError("Value for set_lword_value must be an int or float.")
+    def write_many(self, items: Sequence[Tuple[int, str, object]]):
+        """
+        Writes several values with a single lock acquisition.
+        'items' is a sequence of (address, var_type, value). Every value is
+        validated and encoded before anything is sent, so a bad item aborts
+        the whole batch. Raises SendError naming the first write that failed.
+        """
+        if not self.is_connected(): raise ConnectionError("Not connected.")
+        for _, var_type, _ in items:
+            _check_var_type(var_type)
+        encoded = [(address, self._setters[var_type], _encode_write(var_type, value))
+                   for address, var_type, value in items]
 
+        failed = None
         with self._lock:
             if not self.client_handle: raise ConnectionError("Client handle destroyed.")
-            success = self._api.lib.set_lword_value(self.client_handle, ctypes.c_uint32(address), ctypes.c_uint64(actual_uint64_value))
-        if not success:
-            if not self._api.lib.is_connected(self.client_handle): self._is_connected_flag = False
-            raise SendError(f"Failed to set lword value at address {address}.")
-        print(f"INFO: set_lword_value(address={address}, value={value} -> uint64:{actual_uint64_value}) sent.")
+            self._write_seq += 1
+            self._thread_writes.seq = self._write_seq
+            span, on_send = self._on_span, self.on_send
+            for index, (address, (setter, setter_name, histogram), raw) in enumerate(encoded):
+                var_type = items[index][1]
+                start = time.perf_counter_ns()
+                success = setter(self.client_handle, address, raw)
+                end = time.perf_counter_ns()
+                histogram.record(end - start)
+                self._stats.writes_sent += 1
+                if span is not None:
+                    span(setter_name, start, end)
+                if on_send is not None:
+                    on_send(var_type, address, raw, end)
+                if not success:
+                    # Native state is read under _lock, while the handle is still alive
+                    failed = (index, bool(self._backend.is_connected(self.client_handle)))
+                    break
+        # _set_connected runs listeners and may fail pending reads: never under _lock
+        if failed is not None:
+            index, link_up = failed
+            if not link_up: self._set_connected(False)
+            raise SendError(f"Failed to write {items[index][1]} value at address {items[index][0]} "
+                            f"({index} of {len(items)} items sent).")
+        logger.debug("write_many sent %d values.", len(items))
 
-    def request_plc_value(self, address: int, var_type: str) -> Union[bool, int, float]:
+    def request_plc_value(self, address: int, var_type: str):
         """
-        Requests a value from the PLC's shared memory.
+        Requests a value from the PLC's shared memory without waiting for it.
         'var_type' can be 'bool', 'byte', 'word', 'dword', or 'lword'.
-        Returns the requested value, or raises an error if the request fails.
+        The reply refreshes the shadow memory (see get_cached()). Only a hint:
+        nothing is sent while another read of the same type is on the wire.
+        Use wait_for_value() or read_many() to get the value itself.
         """
         if not self.is_connected(): raise ConnectionError("Not connected.")
         
-        with self._lock:
-            if not self.client_handle: raise ConnectionError("Client handle destroyed.")
+        _check_var_type(var_type)
 
-            if var_type == 'bool':
-                var_enum = 0
-                self._api.lib.request_value(self.client_handle, ctypes.c_uint32(address), var_enum)
-            elif var_type == 'byte':
-                var_enum = 1
-                self._api.lib.request_value(self.client_handle, ctypes.c_uint32(address), var_enum)
-            elif var_type == 'word':
-                var_enum = 2
-                self._api.lib.request_value(self.client_handle, ctypes.c_uint32(address), var_enum)
-            elif var_type == 'dword':
-                var_enum = 3
-                self._api.lib.request_value(self.client_handle, ctypes.c_uint32(address), var_enum)
-            elif var_type == 'lword':
-                var_enum = 4
-                self._api.lib.request_value(self.client_handle, ctypes.c_uint32(address), var_enum)
-            else:
-                raise ValueError(f"Invalid var_type '{var_type}'. Must be one of: 'bool', 'byte', 'word', 'dword', 'lword'.")
+        slot = self._send_reads([(address, var_type)], self.default_timeout)[0]
+        self._release_pending(slot)
+        if slot.error is not None:
+            raise slot.error
 
-    def wait_for_value(self, address: int, var_type: str, timeout: int = 2) -> Union[bool, int, float]:
+    def wait_for_value(self, address: int, var_type: str, timeout: Optional[float] = None) -> Union[bool, int, float]:
         """
         Waits for a value to be available in the PLC's shared memory.
         'var_type' can be 'bool', 'byte', 'word', 'dword', or 'lword'.
+        'timeout' is in seconds (float, e.g. 0.02); None uses default_timeout.
         Returns the requested value, or raises an error if the request times out.
         """
         if not self.is_connected(): 
             raise ConnectionError("Not connected.")
         
-        self.request_plc_value(address, var_type)
-        
-        start_time = time.time()
+        _check_var_type(var_type)
+
+        if timeout is None: timeout = self.default_timeout
+        deadline = _deadline_ns(timeout)
+        slots = self._send_reads([(address, var_type)], timeout)
+        try:
+            # The message processor sets the slot's event as soon as the reply is applied.
+            start = time.perf_counter_ns()
+            replied = slots[0].event.wait(_remaining(deadline))
+            if self._on_span is not None:
+                self._on_span(f"wait {var_type}[{address}]", start, time.perf_counter_ns())
+            if not replied:
+                self._stats.timeouts[var_type] += 1
+                self._retire_pending(slots[0])
+                raise ApiError(f"Timeout waiting for value at address {address} of type '{var_type}'")
+            if slots[0].error is not None:
+                raise slots[0].error
+            return slots[0].value
+        except ApiError:
+            raise
+        except Exception as e:
+            raise ApiError(f"Error while waiting for value: {str(e)}")
+        finally:
+            self._release_pending(slots[0])
+
+    def read_many(self, items: Sequence[Tuple[int, str]], timeout: Optional[float] = None) -> List[Union[bool, int, ApiError]]:
+        """
+        Reads several values against a shared deadline.
+        'items' is a sequence of (address, var_type) pairs. Reads of different
+        var_types are on the wire together; reads of the same var_type go out
+        one after another, as each reply arrives (the native library can only
+        tell replies of one type apart when one is outstanding).
+        Returns a list in input order; an item that failed or timed out holds
+        the ApiError instance instead of a value.
+        """
+        if not self.is_connected(): raise ConnectionError("Not connected.")
+        for _, var_type in items:
+            _check_var_type(var_type)
+
+        if timeout is None: timeout = self.default_timeout
+        deadline = _deadline_ns(timeout)
+        slots = self._send_reads(items, timeout)
+        try:
+            return self._collect_reads(slots, deadline)
+        finally:
+            for slot in slots:
+                self._release_pending(slot)
+
+    def _send_reads(self, items: Sequence[Tuple[int, str]], timeout: float) -> List[_PendingRead]:
+        """
+        Registers a pending slot per item and sends whatever requests the
+        request channels allow; the message processor sends the rest as
+        replies come in. Single-flight: a slot that is already queued or on
+        the wire (from another caller, or a duplicate item) is joined, and
+        every waiter receives that one reply. A request older than 'timeout'
+        (the caller's own, in seconds) is presumed lost and sent again.
+        The caller must _release_pending() each returned slot.
+        """
+        for address, var_type in items:
+            _check_read_address(address, var_type)
+        max_age_ns = int(timeout * 1e9)
+        slots = [self._acquire_pending(address, var_type, max_age_ns) for address, var_type in items]
+        try:
+            if not self._pump_reads():
+                raise ConnectionError("Client handle destroyed.")
+        except BaseException:
+            for slot in slots:
+                self._release_pending(slot)
+            raise
+        self._wakeup.set()
+        return slots
+
+    def _channels_ready(self) -> bool:
+        """Lock-free hint: could _pump_reads() send or re-send a read right now?"""
+        for index, queue in enumerate(self._queued):
+            slot = self._inflight[index]
+            if slot is not None and slot.resend:
+                return True
+            if queue and (slot is None or slot.waiters <= 0):
+                return True
+        return False
+
+    def _pump_reads(self, blocking: bool = True) -> bool:
+        """
+        Sends the next queued read of every var_type that has nothing on the
+        wire, and re-sends in-flight requests a caller found too old to join.
+        Readers call this after queueing; the message processor calls it
+        without blocking on _lock after a reply frees a channel. An abandoned
+        request keeps its channel closed until its reply arrives or
+        _LATE_REPLY_GRACE_NS has passed; its reply is then counted in _late so
+        that it is dropped should it still come. Returns False if the handle
+        is gone.
+        """
+        if not self._lock.acquire(blocking):
+            return True
+        failed = []
+        try:
+            handle = self.client_handle
+            if not handle:
+                return False
+            with self._pending_lock:
+                now = time.perf_counter_ns()
+                for index, queue in enumerate(self._queued):
+                    slot = self._inflight[index]
+                    if slot is not None:
+                        if slot.waiters > 0:
+                            if slot.resend:
+                                slot.resend = False
+                                if not self._request(handle, slot):
+                                    self._inflight[index] = None
+                                    failed.append(slot)
+                            continue
+                        if now - slot.abandoned_ns < _LATE_REPLY_GRACE_NS:
+                            continue
+                        self._inflight[index] = None
+                        self._late[index] += slot.sends
+                        self._late_until[index] = slot.abandoned_ns + int(self.default_timeout * 1_000_000_000)
+                    if self._stray[index]:
+                        if now < self._quiet_until[index]:
+                            continue
+                        self._stray[index] = 0
+                    while queue:
+                        slot = queue.popleft()
+                        if slot.done or slot.waiters <= 0:
+                            continue # Its callers gave up while it was queued
+                        if self._request(handle, slot):
+                            self._inflight[index] = slot
+                            break
+                        failed.append(slot)
+        finally:
+            self._lock.release()
+        for slot in failed:
+            # Nothing went out, so no reply will come: fail now rather than time out
+            slot.fail(ConnectionError(f"Failed to request {slot.var_type} value at address "
+                                      f"{slot.address}: not connected."))
+        return True
+
+    def _request(self, handle, slot: _PendingRead) -> bool:
+        """One native request_value for 'slot'; called by _pump_reads under both locks."""
+        stats = self._stats
+        start = time.perf_counter_ns()
+        sent = self._backend.request_value(handle, slot.address, _VAR_TYPES[slot.var_type][0])
+        end = time.perf_counter_ns()
+        stats.c_call('request_value').record(end - start)
+        if self._on_span is not None:
+            self._on_span('request_value', start, end)
+        if not sent:
+            return False
+        slot.sends += 1
+        slot.sent_ns = end
+        slot.write_seq = self._write_seq
+        stats.reads_sent += 1
+        if self.on_request is not None:
+            self.on_request(slot.var_type, slot.address, end)
+        if logger.isEnabledFor(TRACE):
+            logger.log(TRACE, "request_value(address=%s, var_type=%s) sent.", slot.address, slot.var_type)
+        return True
+
+    def _collect_reads(self, slots: Sequence[_PendingRead], deadline: int) -> List[Union[bool, int, ApiError]]:
+        """Waits for each slot until 'deadline' (monotonic ns); failures become ApiError items."""
+        results: List[Union[bool, int, ApiError]] = []
+        start = time.perf_counter_ns()
+        for slot in slots:
+            if not slot.event.wait(_remaining(deadline)):
+                self._stats.timeouts[slot.var_type] += 1
+                self._retire_pending(slot)
+                results.append(ApiError(f"Timeout waiting for value at address {slot.address} of type '{slot.var_type}'"))
+            elif slot.error is not None:
+                results.append(slot.error)
+            else:
+                results.append(slot.value)
+        if self._on_span is not None:
+            self._on_span(f"wait {len(slots)} reads", start, time.perf_counter_ns())
+        return results
+
+    def read_array(self, addresses: Sequence[int], var_type: str, timeout: Optional[float] = None) -> 'np.ndarray':
+        """
+        Reads many addresses of one type with one read_many() and returns
+        them as a NumPy array (uint32 for 'dword', uint64 for 'lword', ...).
+        Use dwords_as_floats()/lwords_as_floats() or .view() to reinterpret
+        the result without copying. Raises the first per-item ApiError.
+        """
+        _require_numpy()
+        _check_var_type(var_type)
+        results = self.read_many([(address, var_type) for address in addresses], timeout)
+        for result in results:
+            if isinstance(result, ApiError):
+                raise result
+        return np.array(results, dtype=_NUMPY_DTYPES[var_type])
+
+    def subscribe(self, tags: Sequence[Tuple[int, str]], period_ms: int, callback) -> Subscription:
+        """
+        Polls 'tags', a sequence of (address, var_type) pairs, every 'period_ms'
+        milliseconds on a background thread owned by the client.
+        Whenever any value changes, a dict {(address, var_type): value} of the
+        changed tags is passed to 'callback', or put() on it if it is a queue.
+        Identical tags of subscriptions that fall due on the same tick are read
+        only once. Returns a Subscription whose cancel() stops the polling.
+        """
+        for address, var_type in tags:
+            _check_var_type(var_type)
+            _check_read_address(address, var_type)
+        if period_ms <= 0:
+            raise ValueError("period_ms must be positive.")
+
+        subscription = Subscription(self, tags, period_ms, callback)
+        with self._subs_lock:
+            self._subscriptions.append(subscription)
+        self._start_subscription_poller()
+        return subscription
+
+    def _start_subscription_poller(self):
+        with self._subs_lock:
+            if self._subscriptions and (self._subs_thread is None or not self._subs_thread.is_alive()):
+                self._subs_thread = threading.Thread(target=self._subscription_poller, daemon=True)
+                self._subs_thread.start()
+        self._subs_changed.set()
+
+    def _rearm_subscriptions(self):
+        """After (re)connecting: poll every subscription now and redeliver all its values."""
+        with self._subs_lock:
+            for subscription in self._subscriptions:
+                subscription.next_due = 0.0
+                subscription._last_values.clear()
+        self._start_subscription_poller()
+
+    def unsubscribe(self, subscription: Subscription):
+        """Removes a subscription created by subscribe()."""
+        with self._subs_lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+        self._subs_changed.set()
+
+    def _subscription_poller(self):
+        """
+        Target for the subscription thread. Due times are aligned to multiples
+        of each period so subscriptions with related periods share ticks and
+        their tags are coalesced into a single read_many().
+        """
+        logger.info("Subscription poller started.")
         while True:
-            try:
-                if time.time() - start_time > timeout:
-                    raise ApiError(f"Timeout waiting for value at address {address} of type '{var_type}'")
-                    
-                if var_type == 'bool':
-                    if self._api.BoolCameFromServer.value:
-                        result = ctypes.c_bool()
-                        if self._api.lib.get_bool_value(self.client_handle, ctypes.c_uint32(address), ctypes.byref(result)):
-                            self._api.BoolCameFromServer.value = False
-                            return result.value
-                elif var_type == 'byte':
-                    if self._api.ByteCameFromServer.value:
-                        result = ctypes.c_uint8()
-                        if self._api.lib.get_byte_value(self.client_handle, ctypes.c_uint32(address), ctypes.byref(result)):
-                            self._api.ByteCameFromServer.value = False
-                            return result.value
-                elif var_type == 'word':
-                    if self._api.WordCameFromServer.value:
-                        result = ctypes.c_uint16()
-                        if self._api.lib.get_word_value(self.client_handle, ctypes.c_uint32(address), ctypes.byref(result)):
-                            self._api.WordCameFromServer.value = False
-                            return result.value
-                elif var_type == 'dword':
-                    if self._api.DWordCameFromServer.value:
-                        result = ctypes.c_uint32()
-                        if self._api.lib.get_dword_value(self.client_handle, ctypes.c_uint32(address), ctypes.byref(result)):
-                            self._api.DWordCameFromServer.value = False
-                            return result.value
-                elif var_type == 'lword':
-                    if self._api.LWordCameFromServer.value:
-                        result = ctypes.c_uint64()
-                        if self._api.lib.get_lword_value(self.client_handle, ctypes.c_uint32(address), ctypes.byref(result)):
-                            self._api.LWordCameFromServer.value = False
-                            return result.value
+            # Decide to exit under the lock _start_subscription_poller() checks,
+            # so a subscription added meanwhile starts a new poller
+            with self._subs_lock:
+                if self._stop_event.is_set() or not self._subscriptions:
+                    self._subs_thread = None
+                    break
+                subscriptions = list(self._subscriptions)
+
+            now = time.monotonic()
+            due = [sub for sub in subscriptions if sub.next_due <= now]
+            if due and self.is_connected():
+                tags = list(dict.fromkeys(tag for sub in due for tag in sub.tags))
+                try:
+                    values = dict(zip(tags, self.read_many(tags)))
+                except Exception as e: # One failed poll must not end every subscription
+                    logger.error("Subscription poll failed: %s", e)
+                    values = {}
+                for sub in due:
+                    try:
+                        sub._deliver(values)
+                    except Exception as e:
+                        logger.error("Subscription callback raised: %s", e)
+            for sub in due:
+                sub.next_due = math.floor(time.monotonic() / sub.period + 1) * sub.period
+
+            next_due = min(sub.next_due for sub in subscriptions)
+            self._subs_changed.wait(max(0.0, next_due - time.monotonic()))
+            self._subs_changed.clear()
+        logger.info("Subscription poller stopped.")
+
+    def coalescing_writer(self, max_rate_hz: float = 20.0) -> CoalescingWriter:
+        """
+        Returns a CoalescingWriter that merges repeated writes to the same
+        address and sends them at most 'max_rate_hz' times per second.
+        """
+        return CoalescingWriter(self, max_rate_hz)
+
+    @property
+    def on_span(self):
+        """Hook called as on_span(name, start_ns, end_ns); also receives send-lock waits."""
+        return self._on_span
+
+    @on_span.setter
+    def on_span(self, hook):
+        self._on_span = hook
+        self._lock.on_wait = None if hook is None else (lambda start, end: hook('lock wait', start, end))
+
+    def stats(self) -> Dict[str, object]:
+        """
+        Returns a snapshot of the client's counters and latency histograms.
+        Histograms are summarized as count/min/max/mean/p50/p90/p99/p999, all
+        in nanoseconds except 'replies_per_tick'.
+        'round_trip_ns': request sent to reply applied, per var_type.
+        'lock_wait_ns': time spent waiting to acquire the send lock.
+        'c_call_ns': time inside each native call.
+        'replies_per_tick': replies applied per message processor tick.
+        """
+        stats = self._stats
+        return {
+            'connected': self.is_connected(),
+            'reconnects': self.reconnect_count,
+            'reads_sent': stats.reads_sent,
+            'reads_joined': stats.reads_joined,
+            'writes_sent': stats.writes_sent,
+            'ticks': stats.ticks,
+            'timeouts': dict(stats.timeouts),
+            'round_trip_ns': {var_type: h.snapshot() for var_type, h in stats.round_trip.items()},
+            'lock_wait_ns': stats.lock_wait.snapshot(),
+            'c_call_ns': {name: h.snapshot() for name, h in list(stats.c_calls.items()) if h.count},
+            'replies_per_tick': stats.replies_per_tick.snapshot(),
+        }
+
+    def reset_stats(self):
+        """Clears all counters and histograms."""
+        stats = _ClientStats()
+        self._setters = {var_type: (setter, name, stats.c_call(name))
+                         for var_type, (setter, name, _) in self._setters.items()}
+        self._readers = [(var_type, getter, name, stats.c_call(name), result, result_ref)
+                         for var_type, getter, name, _, result, result_ref in self._readers]
+        self._stats = stats
+        self._lock._histogram = stats.lock_wait
+
+    def get_cached(self, address: int, var_type: str, max_age_ms: int = 100,
+                   timeout: Optional[float] = None) -> Union[bool, int]:
+        """
+        Returns the value of 'address' from the client-side shadow memory if it
+        was received within the last 'max_age_ms' milliseconds; otherwise reads
+        it from the PLC (which also refreshes the shadow).
+        """
+        _check_var_type(var_type)
+        with self._shadow_lock:
+            value = self._shadow[var_type].lookup(address, max_age_ms / 1000.0, time.monotonic())
+        if value is not None:
+            return value
+        return self.wait_for_value(address, var_type, timeout)
+
+    def invalidate_cache(self):
+        """Forgets every value held in the shadow memory."""
+        with self._shadow_lock:
+            for shadow in self._shadow.values():
+                shadow.clear()
+
+    def _acquire_pending(self, address: int, var_type: str, max_age_ns: int) -> _PendingRead:
+        """
+        Registers the caller as a waiter on the (var_type, address) slot,
+        queueing a new one for _pump_reads() if there is none to join. The
+        in-flight read of the type is adopted when it is for this address,
+        even if earlier callers gave up on it. A request that was given up
+        on, or went out 'max_age_ns' or more ago, is marked for re-sending:
+        a reply to either request carries the same address. A request sent
+        before the calling thread's latest write is never joined, as its
+        reply may predate the write.
+        """
+        key = (var_type, address)
+        written = getattr(self._thread_writes, 'seq', 0)
+        with self._pending_lock:
+            slot = self._pending.get(key)
+            if slot is None or slot.done or slot.sends and slot.write_seq < written:
+                inflight = self._inflight[_VAR_TYPES[var_type][0]]
+                if inflight is not None and inflight.address == address and inflight.write_seq >= written:
+                    # Its callers timed out or left: adopt it, with a fresh request
+                    slot = self._pending[key] = inflight
+                    slot.resend = True
                 else:
-                    raise ValueError(f"Invalid var_type '{var_type}'. Must be one of: 'bool', 'byte', 'word', 'dword', 'lword'.")
-                
-                time.sleep(0.01)  # Small sleep to prevent busy waiting
-                
-            except Exception as e:
-                raise ApiError(f"Error while waiting for value: {str(e)}")
+                    slot = _PendingRead(var_type, address)
+                    self._pending[key] = slot
+                    self._queued[_VAR_TYPES[var_type][0]].append(slot)
+            if slot.sends or slot.waiters:
+                self._stats.reads_joined += 1
+                if slot.sends and time.perf_counter_ns() - slot.sent_ns >= max_age_ns:
+                    slot.resend = True
+            slot.waiters += 1
+            return slot
+
+    def _retire_pending(self, slot: _PendingRead):
+        """
+        Called when a waiter timed out on 'slot': later callers get a fresh
+        slot and request instead of joining this one. Remaining waiters keep
+        waiting on it.
+        """
+        with self._pending_lock:
+            key = (slot.var_type, slot.address)
+            if self._pending.get(key) is slot:
+                del self._pending[key]
+
+    def _release_pending(self, slot: _PendingRead):
+        """
+        Drops the caller's interest; the last waiter removes the slot. A slot
+        left with no waiters is skipped if still queued, and if its request is
+        on the wire its reply is still awaited (see _pump_reads).
+        """
+        with self._pending_lock:
+            slot.waiters -= 1
+            if slot.waiters > 0:
+                return
+            key = (slot.var_type, slot.address)
+            if self._pending.get(key) is slot:
+                del self._pending[key]
+            if not slot.done and self._inflight[_VAR_TYPES[slot.var_type][0]] is slot:
+                slot.abandoned_ns = time.perf_counter_ns()
     
     
-    def get_bool_value(self, address: int) -> bool:
+    def get_bool_value(self, address: int, timeout: Optional[float] = None) -> bool:
         """Gets a boolean value from the PLC's shared memory."""
-        return self.wait_for_value(address, 'bool')
+        return self.wait_for_value(address, 'bool', timeout)
 
-    def get_byte_value(self, address: int) -> int:
+    def get_byte_value(self, address: int, timeout: Optional[float] = None) -> int:
         """Gets a byte value (0-255) from the PLC's shared memory."""
-        return self.wait_for_value(address, 'byte')
+        return self.wait_for_value(address, 'byte', timeout)
 
-    def get_word_value(self, address: int) -> int:
+    def get_word_value(self, address: int, timeout: Optional[float] = None) -> int:
         """Gets a word value (0-65535) from the PLC's shared memory."""
-        return self.wait_for_value(address, 'word')
+        return self.wait_for_value(address, 'word', timeout)
 
-    def get_dword_value(self, address: int) -> int:
+    def get_dword_value(self, address: int, timeout: Optional[float] = None) -> int:
         """Gets a dword value (0-4294967295) from the PLC's shared memory."""
-        return self.wait_for_value(address, 'dword')
+        return self.wait_for_value(address, 'dword', timeout)
         
-    def get_lword_value(self, address: int) -> int:
+    def get_lword_value(self, address: int, timeout: Optional[float] = None) -> int:
         """Gets an lword value (0 to 2^64-1) from the PLC's shared memory."""
-        return self.wait_for_value(address, 'lword')
+        return self.wait_for_value(address, 'lword', timeout)
 
 
     def __enter__(self):
@@ -431,3 +1957,349 @@ class Client:
             self.disconnect()
 
 
+# --- Tracing ---
+class ChromeTraceRecorder:
+    """
+    Records Client hook calls as Chrome Trace Event JSON, viewable in
+    Perfetto or chrome://tracing. Spans (lock waits, C calls, waits,
+    processor ticks) land on the thread that ran them; each request/reply
+    round trip is an async slice; writes are instant events.
+
+        recorder = ChromeTraceRecorder()
+        recorder.attach(client)
+        ...
+        recorder.save("trace.json")
+    """
+    def __init__(self):
+        self.events: List[dict] = []
+        self._pid = os.getpid()
+        self._next_id = 0
+
+    def attach(self, client: 'Client'):
+        client.on_span = self.on_span
+        client.on_request = self.on_request
+        client.on_reply = self.on_reply
+        client.on_send = self.on_send
+
+    @staticmethod
+    def detach(client: 'Client'):
+        client.on_span = client.on_request = client.on_reply = client.on_send = None
+
+    def on_span(self, name: str, start_ns: int, end_ns: int):
+        self.events.append({'name': name, 'ph': 'X', 'ts': start_ns / 1000, 'dur': (end_ns - start_ns) / 1000,
+                            'pid': self._pid, 'tid': threading.get_ident()})
+
+    def on_request(self, var_type: str, address: int, sent_ns: int):
+        self.events.append({'name': f"request {var_type}[{address}]", 'ph': 'i', 's': 't', 'ts': sent_ns / 1000,
+                            'pid': self._pid, 'tid': threading.get_ident()})
+
+    def on_reply(self, var_type: str, address: int, value, sent_ns: int, received_ns: int):
+        self._next_id += 1
+        common = {'name': f"round trip {var_type}[{address}]", 'cat': 'round_trip', 'id': self._next_id,
+                  'pid': self._pid, 'tid': threading.get_ident()}
+        self.events.append(dict(common, ph='b', ts=sent_ns / 1000))
+        self.events.append(dict(common, ph='e', ts=received_ns / 1000, args={'value': value}))
+
+    def on_send(self, var_type: str, address: int, raw_value, sent_ns: int):
+        self.events.append({'name': f"set {var_type}[{address}]", 'ph': 'i', 's': 't', 'ts': sent_ns / 1000,
+                            'pid': self._pid, 'tid': threading.get_ident(), 'args': {'value': raw_value}})
+
+    def save(self, path: str):
+        """Writes the recorded events as a Chrome trace file."""
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}, f)
+
+
+# --- Multi-controller Fleet ---
+class Fleet:
+    """
+    Manages Client connections to many controllers, keyed by "host:port".
+    All clients are serviced by a small pool of shared message processing
+    threads ('threads', one by default) instead of one thread each, and
+    read_all()/write_all() fan a request out across machines.
+    """
+    def __init__(self, lib_path: str = LIB_NAME, threads: int = 1, latency_mode: str = 'balanced',
+                 backend: Optional[Backend] = None):
+        if threads < 1:
+            raise ValueError("threads must be at least 1.")
+        if latency_mode not in _LATENCY_MODES:
+            raise ValueError(f"Invalid latency_mode '{latency_mode}'. Must be one of: 'low', 'balanced', 'idle'.")
+        self.lib_path = lib_path
+        self.latency_mode = latency_mode
+        self.backend = backend
+        self._clients: Dict[str, Client] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        # One (client list, wakeup event, lock) per worker thread
+        self._workers = [([], threading.Event(), threading.RLock()) for _ in range(threads)]
+        self._threads = []
+        for index in range(threads):
+            thread = threading.Thread(target=self._worker, args=(index,), daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    @staticmethod
+    def key(host: str, port: int) -> str:
+        return f"{host}:{port}"
+
+    def add(self, host: str, port: int, timeout: float = 5) -> Client:
+        """Creates a client serviced by the fleet and connects it."""
+        key = self.key(host, port)
+        with self._lock:
+            if key in self._clients:
+                raise ApiError(f"{key} is already part of the fleet.")
+            clients, wakeup, worker_lock = min(self._workers, key=lambda worker: len(worker[0]))
+            client = Client(self.lib_path, self.latency_mode, wakeup=wakeup, backend=self.backend)
+            client._fleet = self
+            self._clients[key] = client
+        with worker_lock:
+            clients.append(client)
+        try:
+            client.connect(host, port, timeout)
+        except ApiError:
+            self.remove(key)
+            raise
+        return client
+
+    def connect_all(self, hosts: Sequence[Tuple[str, int]], timeout: float = 5,
+                    max_concurrency: int = 16) -> Iterator[Tuple[str, Union[Client, ApiError]]]:
+        """
+        Connects to many controllers concurrently, at most 'max_concurrency'
+        at a time, so startup takes about as long as the slowest reachable
+        host rather than the sum of all timeouts. Every attempt is started
+        before this returns, and runs whether or not the result is iterated.
+        Returns an iterator that yields (key, Client) or (key, ApiError) as
+        each attempt finishes.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="fleet-connect")
+        futures = {pool.submit(self.add, host, port, timeout): self.key(host, port) for host, port in hosts}
+        pool.shutdown(wait=False) # Queued attempts still run; the workers exit once done
+        return self._connect_results(futures)
+
+    @staticmethod
+    def _connect_results(futures: Dict[Future, str]) -> Iterator[Tuple[str, Union[Client, ApiError]]]:
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result()
+            except ApiError as e:
+                yield futures[future], e
+
+    def remove(self, key: str):
+        """Disconnects the client for 'key' and drops it from the fleet."""
+        with self._lock:
+            client = self._clients.pop(key, None)
+        if client is not None:
+            client.disconnect()
+
+    def _detach(self, client: Client):
+        """
+        Stops servicing 'client'; returns once no worker is inside its tick.
+        The client gets its own wakeup event back, so a later connect() starts
+        its own message processor.
+        """
+        for clients, _, worker_lock in self._workers:
+            with worker_lock:
+                if client in clients:
+                    clients.remove(client)
+        client._fleet = None
+        client._wakeup = threading.Event()
+
+    def _worker(self, index: int):
+        clients, wakeup, worker_lock = self._workers[index]
+        pacer = _Pacer()
+        logger.info("Fleet worker %d started.", index)
+        while not self._stop_event.is_set():
+            busy = False
+            with worker_lock:
+                # A copy: a listener run by the tick may disconnect (detach) its client
+                for client in tuple(clients):
+                    busy = client._process_once() or busy
+            pacer.wait(wakeup, self.latency_mode, busy)
+        logger.info("Fleet worker %d stopped.", index)
+
+    def __getitem__(self, key: str) -> Client:
+        return self._clients[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._clients
+
+    def __iter__(self):
+        return iter(list(self._clients))
+
+    def __len__(self):
+        return len(self._clients)
+
+    def _select(self, keys: Optional[Sequence[str]]) -> Dict[str, Client]:
+        with self._lock:
+            if keys is None:
+                return dict(self._clients)
+            return {key: self._clients[key] for key in keys}
+
+    def read_all(self, items: Sequence[Tuple[int, str]], timeout: float = 2,
+                 keys: Optional[Sequence[str]] = None) -> Dict[str, Union[List[Union[bool, int, ApiError]], ApiError]]:
+        """
+        Reads the same (address, var_type) items from every controller (or
+        those in 'keys'). Requests go out to all machines before any reply is
+        awaited, so the fan-out costs about as long as reading the items from
+        one machine.
+        Returns {key: results}; a machine that could not be asked maps to the
+        ApiError instead of a list.
+        """
+        for address, var_type in items:
+            _check_var_type(var_type)
+            _check_read_address(address, var_type)
+        sent: Dict[str, Tuple[Client, List[_PendingRead]]] = {}
+        results: Dict[str, Union[List[Union[bool, int, ApiError]], ApiError]] = {}
+        for key, client in self._select(keys).items():
+            try:
+                if not client.is_connected(): raise ConnectionError("Not connected.")
+                sent[key] = (client, client._send_reads(items, timeout))
+            except ApiError as e:
+                results[key] = e
+
+        deadline = _deadline_ns(timeout)
+        for key, (client, slots) in sent.items():
+            try:
+                results[key] = client._collect_reads(slots, deadline)
+            finally:
+                for slot in slots:
+                    client._release_pending(slot)
+        return results
+
+    def write_all(self, items: Sequence[Tuple[int, str, object]],
+                  keys: Optional[Sequence[str]] = None) -> Dict[str, Optional[Exception]]:
+        """
+        Writes the same (address, var_type, value) items to every controller
+        (or those in 'keys') with write_many(). Returns {key: None} on success
+        or {key: exception} for machines where the write failed.
+        """
+        results: Dict[str, Optional[Exception]] = {}
+        for key, client in self._select(keys).items():
+            try:
+                client.write_many(items)
+                results[key] = None
+            except (ApiError, SendError) as e:
+                results[key] = e
+        return results
+
+    def close(self):
+        """Disconnects every client and stops the worker threads."""
+        for key in list(self._clients):
+            self.remove(key)
+        self._stop_event.set()
+        for _, wakeup, _ in self._workers:
+            wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+# --- asyncio Client ---
+class AsyncClient:
+    """
+    asyncio front end for Client.
+    Reads are resolved by the Client's message processor thread through
+    futures, so thousands of awaits can be in flight without a thread each.
+    Writes are non-blocking native sends and are issued directly.
+    """
+    def __init__(self, host: str, port: int, lib_path: str = LIB_NAME, timeout: float = 5,
+                 backend: Optional[Backend] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.client = Client(lib_path, backend=backend)
+
+    async def connect(self):
+        """Connects without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.client.connect, self.host, self.port, self.timeout)
+
+    async def disconnect(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.client.disconnect)
+
+    def is_connected(self) -> bool:
+        return self.client.is_connected()
+
+    async def read(self, address: int, var_type: str, timeout: Optional[float] = None) -> Union[bool, int]:
+        """Reads one value; the awaiting task is woken when the reply is processed."""
+        _check_var_type(var_type)
+        if timeout is None: timeout = self.client.default_timeout
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def resolve(slot: _PendingRead):
+            if future.done():
+                return
+            if slot.error is not None:
+                future.set_exception(slot.error)
+            else:
+                future.set_result(slot.value)
+
+        def on_done(slot: _PendingRead):
+            try:
+                loop.call_soon_threadsafe(resolve, slot)
+            except RuntimeError:
+                pass  # Event loop already closed
+
+        if not self.client.is_connected(): raise ConnectionError("Not connected.")
+        slot = self.client._send_reads([(address, var_type)], timeout)[0]
+        try:
+            slot.add_done_callback(on_done)
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                self.client._stats.timeouts[var_type] += 1
+                self.client._retire_pending(slot)
+                raise ApiError(f"Timeout waiting for value at address {address} of type '{var_type}'")
+        finally:
+            self.client._release_pending(slot)
+
+    async def read_many(self, items: Sequence[Tuple[int, str]], timeout: Optional[float] = None) -> List[Union[bool, int, ApiError]]:
+        """Reads (address, var_type) pairs concurrently; failed items hold their exception."""
+        return await asyncio.gather(*(self.read(address, var_type, timeout) for address, var_type in items),
+                                    return_exceptions=True)
+
+    async def get_bool(self, address: int, timeout: Optional[float] = None) -> bool:
+        return await self.read(address, 'bool', timeout)
+
+    async def get_byte(self, address: int, timeout: Optional[float] = None) -> int:
+        return await self.read(address, 'byte', timeout)
+
+    async def get_word(self, address: int, timeout: Optional[float] = None) -> int:
+        return await self.read(address, 'word', timeout)
+
+    async def get_dword(self, address: int, timeout: Optional[float] = None) -> int:
+        return await self.read(address, 'dword', timeout)
+
+    async def get_lword(self, address: int, timeout: Optional[float] = None) -> int:
+        return await self.read(address, 'lword', timeout)
+
+    async def set_bool(self, address: int, value: bool):
+        self.client.set_bool_value(address, value)
+
+    async def set_byte(self, address: int, value: int):
+        self.client.set_byte_value(address, value)
+
+    async def set_word(self, address: int, value: int):
+        self.client.set_word_value(address, value)
+
+    async def set_dword(self, address: int, value: Union[int, float]):
+        self.client.set_dword_value(address, value)
+
+    async def set_lword(self, address: int, value: Union[int, float]):
+        self.client.set_lword_value(address, value)
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.disconnect()
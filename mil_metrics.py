@@ -0,0 +1,170 @@
+"""
+Prometheus exporter for mil_api Client and Fleet statistics.
+
+A background thread snapshots Client.stats() every 'interval' seconds and
+renders the Prometheus text format once; the HTTP endpoint only serves that
+cached text, so scrapes never touch the clients or their locks.
+
+    exporter = MetricsExporter(fleet, port=9464)
+    exporter.start()
+    ...
+    exporter.stop()
+"""
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Union
+
+from mil_api import Client, Fleet
+
+logger = logging.getLogger("mil_api.metrics")
+
+_QUANTILES = (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99'), ('0.999', 'p999'))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + '}'
+
+
+class MetricsExporter:
+    """
+    Serves connection state, reconnects, read/write rates, per-type round-trip
+    quantiles and timeouts of one or more clients at http://host:port/metrics.
+    'sources' is a Client, a Fleet, or a dict {name: Client}.
+    """
+    def __init__(self, sources: Union[Client, Fleet, Dict[str, Client]],
+                 host: str = '127.0.0.1', port: int = 9464, interval: float = 1.0):
+        self.sources = sources
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self._text = b''
+        self._previous: Dict[str, tuple] = {}
+        self._stop_event = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._threads: List[threading.Thread] = []
+
+    def _clients(self) -> Dict[str, Client]:
+        if isinstance(self.sources, Fleet):
+            clients = {}
+            for key in self.sources:
+                try:
+                    clients[key] = self.sources[key]
+                except KeyError:
+                    pass  # Removed while we were iterating
+            return clients
+        if isinstance(self.sources, Client):
+            client = self.sources
+            name = f"{client._host}:{client._port}" if client._host else 'client'
+            return {name: client}
+        return dict(self.sources)
+
+    def render(self) -> str:
+        """Builds the exposition text from a fresh snapshot of every client."""
+        now = time.monotonic()
+        gauges: Dict[str, List[str]] = {}
+
+        def add(name: str, kind: str, help_text: str, labels: str, value, suffix: str = ''):
+            if name not in gauges:
+                gauges[name] = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            gauges[name].append(f"{name}{suffix}{labels} {value}")
+
+        if isinstance(self.sources, Fleet):
+            add('mil_fleet_clients', 'gauge', 'Controllers managed by the fleet.', '', len(self.sources))
+
+        for controller, client in self._clients().items():
+            stats = client.stats()
+            base = _labels(controller=controller)
+            add('mil_connected', 'gauge', 'Whether the controller link is up.', base, int(stats['connected']))
+            add('mil_reconnects_total', 'counter', 'Automatic reconnects.', base, stats['reconnects'])
+            add('mil_reads_sent_total', 'counter', 'Read requests put on the wire.', base, stats['reads_sent'])
+            add('mil_reads_joined_total', 'counter', 'Reads served by a request already in flight.', base, stats['reads_joined'])
+            add('mil_writes_sent_total', 'counter', 'Writes put on the wire.', base, stats['writes_sent'])
+            add('mil_processor_ticks_total', 'counter', 'Message processor ticks.', base, stats['ticks'])
+
+            previous = self._previous.get(controller)
+            if previous:
+                elapsed = now - previous[0]
+                if elapsed > 0:
+                    add('mil_read_rate', 'gauge', 'Reads sent per second over the last interval.', base,
+                        round((stats['reads_sent'] - previous[1]) / elapsed, 3))
+                    add('mil_write_rate', 'gauge', 'Writes sent per second over the last interval.', base,
+                        round((stats['writes_sent'] - previous[2]) / elapsed, 3))
+            self._previous[controller] = (now, stats['reads_sent'], stats['writes_sent'])
+
+            for var_type, count in stats['timeouts'].items():
+                add('mil_timeouts_total', 'counter', 'Reads that timed out.',
+                    _labels(controller=controller, var_type=var_type), count)
+            for var_type, histogram in stats['round_trip_ns'].items():
+                for quantile, key in _QUANTILES:
+                    add('mil_round_trip_seconds', 'summary', 'Request to reply round trip.',
+                        _labels(controller=controller, var_type=var_type, quantile=quantile), histogram[key] / 1e9)
+                labels = _labels(controller=controller, var_type=var_type)
+                add('mil_round_trip_seconds', 'summary', '', labels,
+                    histogram['mean'] * histogram['count'] / 1e9, suffix='_sum')
+                add('mil_round_trip_seconds', 'summary', '', labels, histogram['count'], suffix='_count')
+            lock_wait = stats['lock_wait_ns']
+            for quantile, key in _QUANTILES:
+                add('mil_lock_wait_seconds', 'summary', 'Time waiting for the send lock.',
+                    _labels(controller=controller, quantile=quantile), lock_wait[key] / 1e9)
+
+        lines = [line for block in gauges.values() for line in block]
+        return '\n'.join(lines) + '\n'
+
+    def _snapshotter(self):
+        while not self._stop_event.is_set():
+            try:
+                self._text = self.render().encode('utf-8')
+            except Exception as e:
+                logger.error("Metrics snapshot failed: %s", e)
+            self._stop_event.wait(self.interval)
+
+    def start(self):
+        """Starts the snapshot thread and the HTTP server."""
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = exporter._text
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("metrics: " + format, *args)
+
+        self._stop_event.clear()
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.port = self._server.server_address[1]
+        self._threads = [threading.Thread(target=self._snapshotter, daemon=True),
+                         threading.Thread(target=self._server.serve_forever, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        logger.info("Metrics exporter listening on http://%s:%s/metrics", self.host, self.port)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -0,0 +1,247 @@
+"""
+Offline stand-in for a MILTEKSAN controller.
+
+Speaks the same asio protocol as the native client library, so Client (and
+every sample) can connect to it instead of a real controller:
+
+    server = SimulatorServer(port=60000)
+    server.start()
+    with mil_api.Client() as client:
+        client.connect("127.0.0.1", server.port)
+        client.set_dword_value(10, 1234)
+        client.get_dword_value(10)   # -> 1234
+    server.stop()
+
+or from a shell: python mil_sim.py --port 60000
+
+Wire format (Network::Message<MsgTypes>, little-endian):
+    header  u32 id, u32 body size
+    body    values are appended in order and popped from the end
+
+    on connect   server sends a u64 challenge, client answers Scramble(challenge),
+                 server sends ServerAccept (empty body)
+    ServerPing   body i64 timestamp, echoed back unchanged
+    Request      body u32 address, u8 type        -> Reply<type> body value, u32 address
+    Set<type>    body u16 address, value          (no reply)
+
+All connections share one memory image per type, like the controller's PLC
+memory. Everything runs on a single asyncio loop in a background thread, so
+thousands of concurrent clients cost one socket each and no threads.
+"""
+import argparse
+import asyncio
+import logging
+import random
+import struct
+import threading
+from array import array
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger("mil_api.sim")
+
+# MsgTypes ids, as used by the native library
+MSG_SERVER_ACCEPT = 0
+MSG_SERVER_DENY = 1
+MSG_SERVER_PING = 2
+MSG_REQUEST_VALUE = 27
+MSG_REPLY = {'bool': 28, 'byte': 29, 'word': 30, 'dword': 31, 'lword': 32}
+MSG_SET = {'bool': 33, 'byte': 34, 'word': 35, 'dword': 36, 'lword': 37}
+
+# Type enum carried by MSG_REQUEST_VALUE (same order as mil_api._VAR_TYPES)
+_TYPE_BY_ENUM = ('bool', 'byte', 'word', 'dword', 'lword')
+_VALUE_FORMATS = {'bool': '?', 'byte': 'B', 'word': 'H', 'dword': 'I', 'lword': 'Q'}
+_MEMORY_TYPECODES = {'bool': 'B', 'byte': 'B', 'word': 'H', 'dword': 'I', 'lword': 'Q'}
+MEMORY_SIZE = 0x10000  # Set messages carry a u16 address
+
+_HEADER = struct.Struct('<II')
+_U64 = struct.Struct('<Q')
+_U16 = struct.Struct('<H')
+_REQUEST = struct.Struct('<IB')
+_REPLIES = {var_type: struct.Struct('<' + fmt + 'I') for var_type, fmt in _VALUE_FORMATS.items()}
+_SETS = {MSG_SET[var_type]: (var_type, struct.Struct('<H' + fmt)) for var_type, fmt in _VALUE_FORMATS.items()}
+
+
+def scramble(value: int) -> int:
+    """The handshake transform the client applies to the server's challenge."""
+    value ^= 0x0DEADBEEFCDECAFE
+    value = (value << 4) & 0x0FFFFFFFFFFFFFF0
+    return value ^ 0xC0DEFACE12345678
+
+
+class _Connection(asyncio.Protocol):
+    """One client connection: handshake, then header/body framing and dispatch."""
+
+    def __init__(self, server: 'SimulatorServer'):
+        self.server = server
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer = bytearray()
+        self.challenge = random.getrandbits(64)
+        self.validated = False
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.server.connections.add(self)
+        transport.write(_U64.pack(self.challenge))
+
+    def connection_lost(self, exc):
+        self.server.connections.discard(self)
+
+    def data_received(self, data: bytes):
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        if not self.validated:
+            if len(buffer) < _U64.size:
+                return
+            if _U64.unpack_from(buffer)[0] != scramble(self.challenge):
+                logger.warning("Rejecting %s: bad handshake", self.transport.get_extra_info('peername'))
+                self.transport.close()
+                return
+            self.validated = True
+            offset = _U64.size
+            self.transport.write(_HEADER.pack(MSG_SERVER_ACCEPT, 0))
+
+        # Answer every complete message in this chunk with a single write
+        out = bytearray()
+        end = len(buffer)
+        while end - offset >= _HEADER.size:
+            msg_id, size = _HEADER.unpack_from(buffer, offset)
+            if end - offset - _HEADER.size < size:
+                break
+            body_start = offset + _HEADER.size
+            offset = body_start + size
+            self.server._handle(msg_id, buffer, body_start, size, out)
+        del buffer[:offset]
+        if out:
+            if self.server.reply_delay:
+                asyncio.get_running_loop().call_later(self.server.reply_delay, self._write, bytes(out))
+            else:
+                self.transport.write(out)
+
+    def _write(self, data: bytes):
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+
+class SimulatorServer:
+    """
+    Local controller stand-in on host:port. Port 0 picks a free port; read
+    'port' after start(). 'reply_delay' (seconds) holds back replies to model
+    a slower controller.
+    """
+    def __init__(self, host: str = '127.0.0.1', port: int = 60000, reply_delay: float = 0.0):
+        self.host = host
+        self.port = port
+        self.reply_delay = reply_delay
+        self.memory: Dict[str, array] = {var_type: array(code, bytes(MEMORY_SIZE * array(code).itemsize))
+                                         for var_type, code in _MEMORY_TYPECODES.items()}
+        self.connections = set()
+        self.messages = 0
+        self.requests = 0
+        self.writes = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    # --- Memory access for tests ---
+    def peek(self, var_type: str, address: int) -> Union[bool, int]:
+        value = self.memory[var_type][address]
+        return bool(value) if var_type == 'bool' else value
+
+    def poke(self, var_type: str, address: int, value: Union[bool, int]):
+        """Changes controller memory, as the PLC program would."""
+        self.memory[var_type][address] = int(value)
+
+    # --- Protocol ---
+    def _handle(self, msg_id: int, buffer: bytearray, start: int, size: int, out: bytearray):
+        self.messages += 1
+        if msg_id == MSG_REQUEST_VALUE:
+            address, type_enum = _REQUEST.unpack_from(buffer, start + size - _REQUEST.size)
+            var_type = _TYPE_BY_ENUM[type_enum]
+            memory = self.memory[var_type]
+            value = memory[address] if address < MEMORY_SIZE else 0
+            reply = _REPLIES[var_type]
+            out += _HEADER.pack(MSG_REPLY[var_type], reply.size)
+            out += reply.pack(value, address)
+            self.requests += 1
+        elif msg_id in _SETS:
+            var_type, body = _SETS[msg_id]
+            address, value = body.unpack_from(buffer, start + size - body.size)
+            self.memory[var_type][address] = value
+            self.writes += 1
+        elif msg_id == MSG_SERVER_PING:
+            out += _HEADER.pack(msg_id, size)
+            out += buffer[start:start + size]
+        else:
+            logger.debug("Ignoring message id %d (%d bytes)", msg_id, size)
+
+    # --- Lifecycle ---
+    async def serve(self):
+        """Serves on the running event loop until cancelled."""
+        self._server = await asyncio.get_running_loop().create_server(
+            lambda: _Connection(self), self.host, self.port, reuse_address=True, backlog=1024)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info("Simulator listening on %s:%d", self.host, self.port)
+        self._started.set()
+        async with self._server:
+            await self._server.serve_forever()
+
+    def start(self):
+        """Starts serving on a background thread and returns once listening."""
+        if self._thread is not None:
+            return
+        self._started.clear()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="mil-sim", daemon=True)
+        self._thread.start()
+        if not self._started.wait(5.0):
+            raise RuntimeError(f"Simulator failed to listen on {self.host}:{self.port}")
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        task = self._loop.create_task(self.serve())
+        try:
+            self._loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        except OSError as e:
+            logger.error("Simulator stopped: %s", e)
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        def shutdown():
+            for connection in list(self.connections):
+                connection.transport.abort()
+            for task in asyncio.all_tasks(self._loop):
+                task.cancel()
+        self._loop.call_soon_threadsafe(shutdown)
+        self._thread.join(timeout=5.0)
+        self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MILTEKSAN controller simulator")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=60000)
+    parser.add_argument('--reply-delay', type=float, default=0.0, help="seconds to hold back each reply")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    try:
+        asyncio.run(SimulatorServer(args.host, args.port, args.reply_delay).serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -358,8 +358,12 @@ class CNCClientApp:
 
             if self.client.is_connected():
                 try:
-                    for i, addr in enumerate(addresses):
-                        dword_val = self.client.get_dword_value(addr)
+                    # All six axes in one call; reads of one type go out one after another
+                    results = self.client.read_many([(addr, 'dword') for addr in addresses])
+                    for i, dword_val in enumerate(results):
+                        if isinstance(dword_val, ApiError):
+                            print(f"ERROR reading position {addresses[i]}: {dword_val}")
+                            continue
                         real_val = self.dword_to_real(dword_val)
                         formatted_val = f"{real_val:.3f}"
                         
@@ -349,11 +349,13 @@ class MilConnApp:
         if not self.client or not self.is_connected:
             return
         try:
-            self.client.set_byte_value(0, int(self.axis_var.get()))
-            self.client.set_lword_value(2, float(self.vel_var.get()))
-            self.client.set_lword_value(3, float(self.acc_var.get()))
-            self.client.set_lword_value(4, float(self.dec_var.get()))
-            self.client.set_lword_value(5, float(self.jerk_var.get()))
+            self.client.write_many([
+                (0, 'byte', int(self.axis_var.get())),
+                (2, 'lword', float(self.vel_var.get())),
+                (3, 'lword', float(self.acc_var.get())),
+                (4, 'lword', float(self.dec_var.get())),
+                (5, 'lword', float(self.jerk_var.get())),
+            ])
             self.status_var.set("✅ Motion params sent to 2,3,4,5")
         except Exception as e:
             messagebox.showerror("Send Error", f"Failed to send motion params.\n\n{e}")
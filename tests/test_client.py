@@ -0,0 +1,483 @@
+"""
+Regression tests for Client on FakeBackend, which behaves like the native
+library: per-handle memory images, getters that succeed whenever the link is
+up, and replies applied by a later process_messages() call.
+
+    python -m pytest -q tests
+"""
+import asyncio
+import os
+import queue
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mil_api import (ApiError, AsyncClient, Client, ConnectionError, FakeBackend,  # noqa: E402
+                     Fleet, Histogram, RecordingBackend, SendError, Tag, TagRegistry)
+
+
+def _requests(recording: RecordingBackend):
+    return [args for _, name, args, _ in recording.calls if name == 'request_value']
+
+
+class SpacedReplies(FakeBackend):
+    """Replies to back-to-back requests arrive a few ticks apart, as over a network."""
+    def request_value(self, handle, address, type_enum):
+        sent = super().request_value(handle, address, type_enum)
+        time.sleep(0.003)
+        return sent
+
+
+class ClientTestCase(unittest.TestCase):
+    def connected_client(self, backend, **kwargs) -> Client:
+        client = Client(backend=backend, **kwargs)
+        client.connect('plc', 60000, timeout=2)
+        self.addCleanup(client.disconnect)
+        return client
+
+
+class CorrelationTests(ClientTestCase):
+    def test_read_many_same_type_returns_each_address(self):
+        fake = SpacedReplies(latency=0.002)
+        for address in range(6):
+            fake.poke('dword', address, 100 + address)
+        client = self.connected_client(fake)
+        self.assertEqual(client.read_many([(address, 'dword') for address in range(6)]),
+                         [100, 101, 102, 103, 104, 105])
+
+    def test_second_read_is_not_served_from_the_stale_image(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        fake.poke('word', 7, 1)
+        self.assertEqual(client.get_word_value(7), 1)
+        fake.poke('word', 7, 2)
+        self.assertEqual(client.get_word_value(7), 2)
+
+    def test_late_reply_is_not_taken_for_the_next_request(self):
+        fake = FakeBackend(latency=0.4)
+        fake.poke('dword', 1, 11)
+        fake.poke('dword', 2, 22)
+        client = self.connected_client(fake)
+        with self.assertRaises(ApiError):
+            client.get_dword_value(1, timeout=0.1)
+        self.assertEqual(client.get_dword_value(2), 22)
+
+    def test_read_after_a_lost_request_is_answered(self):
+        fake = FakeBackend()
+        fake.poke('dword', 2, 22)
+        client = self.connected_client(fake)
+        fake.lose_requests(1)
+        with self.assertRaises(ApiError):
+            client.get_dword_value(1, timeout=0.1)
+        self.assertEqual(client.get_dword_value(2, timeout=1), 22)
+
+    def test_concurrent_readers_get_their_own_address(self):
+        fake = FakeBackend(latency=0.001)
+        for address in range(32):
+            fake.poke('lword', address, address * 1000)
+        client = self.connected_client(fake)
+        errors = []
+
+        def reader(address: int):
+            for _ in range(5):
+                value = client.get_lword_value(address, timeout=2)
+                if value != address * 1000:
+                    errors.append((address, value))
+
+        threads = [threading.Thread(target=reader, args=(address,)) for address in range(32)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+
+    def test_fleet_replies_are_not_shared_between_controllers(self):
+        fake = FakeBackend()
+        fake.host_latency['slow'] = 0.2
+        fake.poke('bool', 80, True)
+        with Fleet(backend=fake) as fleet:
+            fleet.add('fast', 1)
+            fleet.add('slow', 2)
+            self.assertEqual(fleet.read_all([(80, 'bool')], timeout=2),
+                             {'fast:1': [True], 'slow:2': [True]})
+
+    def test_read_outside_the_native_image_is_rejected(self):
+        client = self.connected_client(FakeBackend())
+        with self.assertRaises(ValueError):
+            client.read_many([(0x200, 'dword')])
+
+
+class SingleFlightTests(ClientTestCase):
+    def test_concurrent_reads_of_one_address_share_a_request(self):
+        fake = FakeBackend(latency=0.05)
+        recording = RecordingBackend(fake)
+        fake.poke('dword', 3, 33)
+        client = self.connected_client(recording)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def reader():
+            barrier.wait()
+            results.append(client.get_dword_value(3, timeout=2))
+
+        threads = [threading.Thread(target=reader) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [33] * 8)
+        self.assertEqual(len(_requests(recording)), 1)
+
+    def test_lost_request_is_sent_again(self):
+        fake = FakeBackend()
+        recording = RecordingBackend(fake)
+        fake.poke('dword', 5, 55)
+        client = self.connected_client(recording)
+        fake.lose_requests(1)
+        with self.assertRaises(ApiError):
+            client.get_dword_value(5, timeout=0.1)
+        self.assertEqual(client.get_dword_value(5, timeout=1), 55)
+        self.assertEqual(len(_requests(recording)), 2)
+
+    def test_joiner_resends_a_request_older_than_its_timeout(self):
+        fake = FakeBackend()
+        recording = RecordingBackend(fake)
+        fake.poke('byte', 9, 99)
+        client = self.connected_client(recording)
+        fake.lose_requests(1)
+        patient = []
+        thread = threading.Thread(target=lambda: patient.append(client.get_byte_value(9, timeout=5)))
+        thread.start()
+        time.sleep(0.2)
+        self.assertEqual(client.get_byte_value(9, timeout=0.1), 99)
+        thread.join()
+        self.assertEqual(patient, [99])
+        self.assertEqual(len(_requests(recording)), 2)
+
+    def test_read_after_a_write_does_not_join_an_older_request(self):
+        fake = FakeBackend(latency=0.1)
+        client = self.connected_client(fake)
+        earlier = threading.Thread(target=client.get_dword_value, args=(5,))
+        earlier.start()
+        time.sleep(0.03)
+        client.set_dword_value(5, 99)
+        self.assertEqual(client.get_dword_value(5), 99)
+        earlier.join()
+
+    def test_refused_request_fails_without_waiting_for_the_timeout(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        fake.drop()
+        start = time.monotonic()
+        with self.assertRaises(ApiError):
+            client.get_dword_value(1, timeout=2)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+
+class ReconnectTests(ClientTestCase):
+    def test_reads_resume_after_the_link_drops(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake, auto_reconnect=True)
+        fake.poke('dword', 1, 10)
+        self.assertEqual(client.get_dword_value(1), 10)
+        fake.drop()
+        deadline = time.monotonic() + 5
+        while client.reconnect_count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(client.reconnect_count, 1)
+        fake.poke('dword', 1, 11)
+        self.assertEqual(client.get_dword_value(1), 11)
+
+    def test_listener_may_disconnect_the_client(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        done = threading.Event()
+
+        def listener(connected: bool):
+            if not connected:
+                client.disconnect()
+                done.set()
+
+        client.add_connection_listener(listener)
+        fake.drop()
+        self.assertTrue(done.wait(2))
+        self.assertIsNone(client.client_handle)
+
+
+class WriteTests(ClientTestCase):
+    def test_write_many_rejects_an_unknown_type(self):
+        client = self.connected_client(FakeBackend())
+        with self.assertRaises(ValueError):
+            client.write_many([(1, 'float', 1.0)])
+
+    def test_failed_write_many_releases_the_send_lock(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        with self.assertRaises(SendError):
+            client.write_many([(1, 'word', 1), (0xFFFF, 'word', 2)])
+        client.set_word_value(2, 3)
+        self.assertEqual(fake.peek('word', 2), 3)
+
+    def test_failed_write_keeps_the_link_up(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        with self.assertRaises(SendError):
+            client.set_word_value(0xFFFF, 1)
+        self.assertTrue(client.is_connected())
+        client.set_word_value(2, 3)
+        self.assertEqual(fake.peek('word', 2), 3)
+
+
+class StatsTests(ClientTestCase):
+    def test_native_calls_are_timed_after_reset_stats(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        client.set_word_value(1, 2)
+        client.reset_stats()
+        self.assertNotIn('set_word_value', client.stats()['c_call_ns'])
+        client.set_word_value(1, 3)
+        client.write_many([(2, 'word', 4)])
+        self.assertEqual(client.get_word_value(1), 3)
+        c_calls = client.stats()['c_call_ns']
+        self.assertEqual(c_calls['set_word_value']['count'], 2)
+        self.assertEqual(c_calls['get_word_value']['count'], 1)
+
+
+class HistogramTests(unittest.TestCase):
+    def test_small_values_are_exact(self):
+        histogram = Histogram()
+        for value in range(1, 11):
+            histogram.record(value)
+        self.assertEqual(histogram.snapshot(), {'count': 10, 'min': 1, 'max': 10, 'mean': 5.5,
+                                                'p50': 5, 'p90': 9, 'p99': 10, 'p999': 10})
+
+    def test_large_values_are_within_an_eighth(self):
+        for value in (100, 12_345, 987_654_321):
+            histogram = Histogram()
+            histogram.record(1)
+            histogram.record(value)
+            histogram.record(value * 4)
+            self.assertLessEqual(abs(histogram.percentile(50) - value), value / 8)
+
+    def test_merge_combines_counts_and_bounds(self):
+        first, second = Histogram(), Histogram()
+        first.record(50)
+        second.record(5)
+        second.record(500)
+        first.merge(second)
+        first.merge(Histogram())
+        snapshot = first.snapshot()
+        self.assertEqual((snapshot['count'], snapshot['min'], snapshot['max']), (3, 5, 500))
+        self.assertEqual(first.total, 555)
+
+    def test_empty_snapshot(self):
+        self.assertEqual(Histogram().snapshot(), {'count': 0, 'min': 0, 'max': 0, 'mean': 0.0,
+                                                  'p50': 0, 'p90': 0, 'p99': 0, 'p999': 0})
+
+
+class CacheTests(ClientTestCase):
+    def test_get_cached_serves_a_recent_value_without_a_request(self):
+        fake = FakeBackend()
+        recording = RecordingBackend(fake)
+        fake.poke('word', 6, 60)
+        client = self.connected_client(recording)
+        self.assertEqual(client.get_cached(6, 'word'), 60)
+        fake.poke('word', 6, 61)
+        self.assertEqual(client.get_cached(6, 'word', max_age_ms=10_000), 60)
+        self.assertEqual(len(_requests(recording)), 1)
+        time.sleep(0.02)
+        self.assertEqual(client.get_cached(6, 'word', max_age_ms=10), 61)
+        self.assertEqual(len(_requests(recording)), 2)
+
+    def test_invalidate_cache_forces_a_read(self):
+        fake = FakeBackend()
+        fake.poke('bool', 1, True)
+        client = self.connected_client(fake)
+        self.assertIs(client.get_cached(1, 'bool', max_age_ms=10_000), True)
+        fake.poke('bool', 1, False)
+        client.invalidate_cache()
+        self.assertIs(client.get_cached(1, 'bool', max_age_ms=10_000), False)
+
+
+class TagTests(ClientTestCase):
+    def test_encodings_round_trip_through_the_controller(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        registry = TagRegistry([Tag('running', 1, 'bool')])
+        registry.add('speed', 10, 'dword', 'real')
+        registry.add('position', 11, 'lword', 'lreal')
+        registry.add('temperature', 12, 'word', 'fixed', 0.1)
+        for name, value in (('running', True), ('speed', 1.5), ('position', -2.25), ('temperature', 21.5)):
+            registry.write(client, name, value)
+        self.assertEqual(fake.peek('word', 12), 215)
+        values = registry.read(client, ['running', 'speed', 'position', 'temperature'])
+        self.assertEqual(values['running'], True)
+        self.assertEqual(values['speed'], 1.5)
+        self.assertEqual(values['position'], -2.25)
+        self.assertAlmostEqual(values['temperature'], 21.5)
+        self.assertEqual(len(registry), 4)
+        self.assertIn('speed', registry)
+
+    def test_encoding_must_fit_the_wire_type(self):
+        with self.assertRaises(ValueError):
+            Tag('speed', 10, 'word', 'real')
+        with self.assertRaises(ValueError):
+            Tag('gain', 10, 'word', 'fixed', 0)
+        with self.assertRaises(ValueError):
+            Tag('mode', 10, 'word', 'ascii')
+
+    def test_failed_read_maps_to_the_error(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        registry = TagRegistry()
+        registry.add('speed', 10, 'dword', 'real')
+        fake.lose_requests(1)
+        self.assertIsInstance(registry.read(client, ['speed'], timeout=0.1)['speed'], ApiError)
+
+
+class FailingRequests(FakeBackend):
+    """request_value raises for the next 'failures' calls."""
+    failures = 0
+
+    def request_value(self, handle, address, type_enum):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("request_value failed")
+        return super().request_value(handle, address, type_enum)
+
+
+class SubscriptionTests(ClientTestCase):
+    def test_subscription_delivers_changes(self):
+        fake = FakeBackend()
+        fake.poke('dword', 1, 10)
+        client = self.connected_client(fake)
+        changes = queue.Queue()
+        client.subscribe([(1, 'dword')], 10, changes)
+        self.assertEqual(changes.get(timeout=2), {(1, 'dword'): 10})
+        fake.poke('dword', 1, 11)
+        self.assertEqual(changes.get(timeout=2), {(1, 'dword'): 11})
+
+    def test_subscribe_rejects_an_address_outside_the_native_image(self):
+        client = self.connected_client(FakeBackend())
+        with self.assertRaises(ValueError):
+            client.subscribe([(0x200, 'dword')], 10, queue.Queue())
+
+    def test_poller_survives_a_failed_poll(self):
+        fake = FailingRequests()
+        fake.poke('word', 4, 44)
+        client = self.connected_client(fake)
+        fake.failures = 1
+        changes = queue.Queue()
+        with self.assertLogs('mil_api', 'ERROR'):
+            client.subscribe([(4, 'word')], 10, changes)
+            self.assertEqual(changes.get(timeout=2), {(4, 'word'): 44})
+
+    def test_resubscribing_after_the_last_cancel_restarts_the_poller(self):
+        fake = FakeBackend()
+        fake.poke('byte', 2, 7)
+        client = self.connected_client(fake)
+        for _ in range(20):
+            client.subscribe([(2, 'byte')], 10, queue.Queue()).cancel()
+            changes = queue.Queue()
+            subscription = client.subscribe([(2, 'byte')], 10, changes)
+            self.assertEqual(changes.get(timeout=2), {(2, 'byte'): 7})
+            subscription.cancel()
+
+
+class CoalescingWriterTests(ClientTestCase):
+    def test_writes_are_merged_and_rate_limited(self):
+        fake = FakeBackend()
+        recording = RecordingBackend(fake)
+        client = self.connected_client(recording)
+        with client.coalescing_writer(max_rate_hz=5) as writer:
+            writer.set(1, 'word', 1)
+            time.sleep(0.05)
+            writer.set(1, 'word', 2)
+            writer.set(1, 'word', 3)
+            writer.set(2, 'word', 4)
+            time.sleep(0.4)
+        writes = [(ns, args) for ns, name, args, _ in recording.calls if name == 'set_word_value']
+        self.assertEqual([args for _, args in writes], [(1, 1), (1, 3), (2, 4)])
+        self.assertGreaterEqual(writes[1][0] - writes[0][0], 0.15e9)
+        self.assertEqual(fake.peek('word', 1), 3)
+
+    def test_bad_value_is_rejected_without_losing_the_others(self):
+        fake = FakeBackend()
+        client = self.connected_client(fake)
+        with client.coalescing_writer(max_rate_hz=50) as writer:
+            writer.set(1, 'byte', 10)
+            with self.assertRaises(ValueError):
+                writer.set(2, 'byte', 300)
+            writer.set(3, 'byte', 30)
+        self.assertEqual((fake.peek('byte', 1), fake.peek('byte', 3)), (10, 30))
+
+
+class AsyncClientTests(unittest.TestCase):
+    def run_with_client(self, fake: FakeBackend, body):
+        async def main():
+            async with AsyncClient('plc', 60000, timeout=2, backend=fake) as client:
+                return await body(client)
+        return asyncio.run(main())
+
+    def test_reads_and_writes(self):
+        fake = FakeBackend(latency=0.01)
+        fake.poke('byte', 2, 20)
+
+        async def body(client: AsyncClient):
+            await client.set_word(1, 10)
+            return await client.get_word(1), await client.read_many([(2, 'byte'), (1, 'word')])
+
+        self.assertEqual(self.run_with_client(fake, body), (10, [20, 10]))
+
+    def test_timeout_is_counted_and_the_next_read_succeeds(self):
+        fake = FakeBackend()
+        fake.poke('dword', 3, 30)
+
+        async def body(client: AsyncClient):
+            fake.lose_requests(1)
+            with self.assertRaises(ApiError):
+                await client.get_dword(3, timeout=0.1)
+            return client.client.stats()['timeouts']['dword'], await client.get_dword(3, timeout=1)
+
+        self.assertEqual(self.run_with_client(fake, body), (1, 30))
+
+
+class FleetTests(unittest.TestCase):
+    def test_client_disconnected_from_a_fleet_can_reconnect(self):
+        fake = FakeBackend()
+        fake.poke('word', 3, 33)
+        with Fleet(backend=fake) as fleet:
+            client = fleet.add('a', 1)
+            client.disconnect()
+            client.connect('a', 1, timeout=2)
+            self.addCleanup(client.disconnect)
+            self.assertEqual(client.get_word_value(3), 33)
+
+    def test_connect_all_connects_without_iterating(self):
+        with Fleet(backend=FakeBackend()) as fleet:
+            fleet.connect_all([('a', 1), ('b', 2)])
+            deadline = time.monotonic() + 2
+            while time.monotonic() < deadline:
+                if all(key in fleet and fleet[key].is_connected() for key in ('a:1', 'b:2')):
+                    break
+                time.sleep(0.01)
+            self.assertTrue(fleet['a:1'].is_connected())
+            self.assertTrue(fleet['b:2'].is_connected())
+
+    def test_connect_all_yields_results_as_they_complete(self):
+        fake = FakeBackend()
+        fake.online = False
+        with Fleet(backend=fake) as fleet:
+            start = time.monotonic()
+            results = fleet.connect_all([('down', 1)], timeout=0.5)
+            self.assertLess(time.monotonic() - start, 0.25)
+            (key, result), = results
+            self.assertEqual(key, 'down:1')
+            self.assertIsInstance(result, ConnectionError)
+
+
+if __name__ == '__main__':
+    unittest.main()
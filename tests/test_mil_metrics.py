@@ -0,0 +1,76 @@
+"""
+Tests for the Prometheus exporter, on clients backed by FakeBackend.
+
+    python -m pytest -q tests
+"""
+import os
+import sys
+import time
+import unittest
+import urllib.error
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mil_api import Client, FakeBackend, Fleet  # noqa: E402
+from mil_metrics import MetricsExporter  # noqa: E402
+
+
+class MetricsExporterTests(unittest.TestCase):
+    def connected_client(self) -> Client:
+        client = Client(backend=FakeBackend())
+        client.connect('plc', 60000, timeout=2)
+        self.addCleanup(client.disconnect)
+        return client
+
+    def test_render_reports_a_client(self):
+        client = self.connected_client()
+        client.set_word_value(1, 2)
+        client.get_word_value(1)
+        lines = MetricsExporter(client).render().splitlines()
+        self.assertIn('# TYPE mil_connected gauge', lines)
+        self.assertIn('mil_connected{controller="plc:60000"} 1', lines)
+        self.assertIn('mil_reads_sent_total{controller="plc:60000"} 1', lines)
+        self.assertIn('mil_writes_sent_total{controller="plc:60000"} 1', lines)
+        self.assertIn('mil_round_trip_seconds_count{controller="plc:60000",var_type="word"} 1', lines)
+        self.assertIn('mil_timeouts_total{controller="plc:60000",var_type="dword"} 0', lines)
+
+    def test_rates_appear_from_the_second_snapshot(self):
+        client = self.connected_client()
+        exporter = MetricsExporter({'press "A"': client})
+        self.assertNotIn('mil_read_rate', exporter.render())
+        client.get_dword_value(1)
+        time.sleep(0.01)
+        text = exporter.render()
+        self.assertIn('mil_read_rate{controller="press \\"A\\""}', text)
+        self.assertIn('mil_write_rate{controller="press \\"A\\""} 0.0', text)
+
+    def test_fleet_clients_are_listed(self):
+        with Fleet(backend=FakeBackend()) as fleet:
+            fleet.add('a', 1)
+            fleet.add('b', 2)
+            text = MetricsExporter(fleet).render()
+        self.assertIn('mil_fleet_clients 2', text)
+        self.assertIn('mil_connected{controller="a:1"} 1', text)
+        self.assertIn('mil_connected{controller="b:2"} 1', text)
+
+    def test_http_endpoint_serves_the_snapshot(self):
+        client = self.connected_client()
+        with MetricsExporter(client, port=0, interval=0.05) as exporter:
+            url = f"http://127.0.0.1:{exporter.port}"
+            deadline = time.monotonic() + 2
+            body = b''
+            while not body and time.monotonic() < deadline:
+                with urllib.request.urlopen(url + '/metrics', timeout=2) as response:
+                    self.assertEqual(response.headers['Content-Type'], 'text/plain; version=0.0.4; charset=utf-8')
+                    body = response.read()
+                time.sleep(0.01)
+            self.assertIn(b'mil_connected{controller="plc:60000"} 1', body)
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                urllib.request.urlopen(url + '/other', timeout=2)
+            raised.exception.close()
+            self.assertEqual(raised.exception.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
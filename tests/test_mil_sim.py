@@ -0,0 +1,95 @@
+"""
+Tests for the offline controller simulator, speaking its wire protocol over a
+plain socket (the native client library is not needed).
+
+    python -m pytest -q tests
+"""
+import os
+import socket
+import struct
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mil_sim import (MSG_REPLY, MSG_REQUEST_VALUE, MSG_SERVER_ACCEPT, MSG_SERVER_PING,  # noqa: E402
+                     MSG_SET, SimulatorServer, scramble)
+
+_HEADER = struct.Struct('<II')
+
+
+class SimulatorTests(unittest.TestCase):
+    def setUp(self):
+        self.server = SimulatorServer(port=0)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+    def open_socket(self) -> socket.socket:
+        sock = socket.create_connection(('127.0.0.1', self.server.port), timeout=2)
+        self.addCleanup(sock.close)
+        return sock
+
+    def receive(self, sock: socket.socket, size: int) -> bytes:
+        data = b''
+        while len(data) < size:
+            chunk = sock.recv(size - len(data))
+            if not chunk:
+                raise ConnectionError("closed by the simulator")
+            data += chunk
+        return data
+
+    def connect(self) -> socket.socket:
+        sock = self.open_socket()
+        challenge, = struct.unpack('<Q', self.receive(sock, 8))
+        sock.sendall(struct.pack('<Q', scramble(challenge)))
+        self.assertEqual(_HEADER.unpack(self.receive(sock, _HEADER.size)), (MSG_SERVER_ACCEPT, 0))
+        return sock
+
+    def send(self, sock: socket.socket, msg_id: int, body: bytes):
+        sock.sendall(_HEADER.pack(msg_id, len(body)) + body)
+
+    def request(self, sock: socket.socket, address: int, type_enum: int) -> tuple:
+        self.send(sock, MSG_REQUEST_VALUE, struct.pack('<IB', address, type_enum))
+        msg_id, size = _HEADER.unpack(self.receive(sock, _HEADER.size))
+        return msg_id, self.receive(sock, size)
+
+    def test_set_then_request_returns_the_value(self):
+        sock = self.connect()
+        self.send(sock, MSG_SET['dword'], struct.pack('<HI', 10, 1234))
+        self.assertEqual(self.request(sock, 10, 3), (MSG_REPLY['dword'], struct.pack('<II', 1234, 10)))
+        self.assertEqual(self.server.peek('dword', 10), 1234)
+        self.assertEqual((self.server.writes, self.server.requests), (1, 1))
+
+    def test_memory_is_shared_between_connections(self):
+        self.server.poke('bool', 7, True)
+        first, second = self.connect(), self.connect()
+        self.send(first, MSG_SET['word'], struct.pack('<HH', 3, 333))
+        self.assertEqual(self.request(first, 7, 0), (MSG_REPLY['bool'], struct.pack('<?I', True, 7)))
+        self.assertEqual(self.request(second, 3, 2), (MSG_REPLY['word'], struct.pack('<HI', 333, 3)))
+
+    def test_ping_is_echoed(self):
+        sock = self.connect()
+        body = struct.pack('<q', 123456789)
+        self.send(sock, MSG_SERVER_PING, body)
+        self.assertEqual(_HEADER.unpack(self.receive(sock, _HEADER.size)), (MSG_SERVER_PING, len(body)))
+        self.assertEqual(self.receive(sock, len(body)), body)
+
+    def test_bad_handshake_is_rejected(self):
+        sock = self.open_socket()
+        challenge, = struct.unpack('<Q', self.receive(sock, 8))
+        sock.sendall(struct.pack('<Q', challenge))
+        self.assertEqual(sock.recv(8), b'')
+
+    def test_reply_delay_holds_back_replies(self):
+        self.server.reply_delay = 0.2
+        sock = self.connect()
+        sock.settimeout(0.1)
+        self.send(sock, MSG_REQUEST_VALUE, struct.pack('<IB', 1, 1))
+        with self.assertRaises(socket.timeout):
+            sock.recv(1)
+        sock.settimeout(2)
+        self.assertEqual(_HEADER.unpack(self.receive(sock, _HEADER.size)), (MSG_REPLY['byte'], 5))
+
+
+if __name__ == '__main__':
+    unittest.main()